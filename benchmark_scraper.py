@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark listing extraction against a recorded session
+Replays DOM snapshots offline, so runs need no browser or network
+
+Record:  RECORD_SESSION=logs/canon.json.gz python test_navigation.py
+Replay:  python benchmark_scraper.py logs/canon.json.gz --latency 0.002
+"""
+
+import argparse
+import gzip
+import logging
+import statistics
+import time
+
+from src.core.config_service import PerformanceProfile
+from src.scraper.driver_replay import Recording, ReplayDriver
+from src.scraper.marketplace_scraper import MarketplaceScraper
+
+logger = logging.getLogger(__name__)
+
+# Human delays would swamp everything being measured
+NO_DELAYS = PerformanceProfile(
+    name="benchmark", search_delay=(0, 0), scroll_delay=(0, 0), settle_delay=0
+)
+
+
+def load_recording(path: str) -> Recording:
+    if path.endswith(".html.gz") or path.endswith(".html"):
+        # Artifact HTML dumps start with a "<!-- url -->" line
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8") as f:
+            html = f.read()
+        url = "https://www.facebook.com/marketplace/search/"
+        if html.startswith("<!-- "):
+            header, html = html.split("\n", 1)
+            url = header[5:-4]
+        return Recording.from_html(url, html)
+    return Recording.load(path)
+
+
+def report(name: str, timings, driver: ReplayDriver, runs: int, found: int) -> None:
+    commands = sum(driver.commands.values()) // runs
+    logger.info(
+        f"{name:<24} min {min(timings) * 1000:8.2f} ms   "
+        f"median {statistics.median(timings) * 1000:8.2f} ms   "
+        f"{commands:6d} commands/run   {found} listings"
+    )
+
+
+def bench_extract(recording: Recording, args) -> None:
+    """_extract_visible_listings on the last (largest) snapshot"""
+    driver = ReplayDriver(recording, latency=args.latency)
+    driver.index = len(recording.snapshots) - 1
+    scraper = MarketplaceScraper(driver)
+
+    timings = []
+    found = 0
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        found = len(scraper._extract_visible_listings(set()))
+        timings.append(time.perf_counter() - start)
+    report("extract_visible_listings", timings, driver, args.runs, found)
+
+
+def bench_collect(recording: Recording, args) -> None:
+    """collect_listings over every snapshot, with human delays skipped"""
+    driver = ReplayDriver(recording, latency=args.latency)
+
+    timings = []
+    found = 0
+    for _ in range(args.runs):
+        driver.get(recording.snapshots[0].url)
+        scraper = MarketplaceScraper(driver, prune_dom=args.prune, profile=NO_DELAYS)
+        start = time.perf_counter()
+        found = len(
+            scraper.collect_listings(
+                max_listings=args.max_listings, max_scrolls=len(recording.snapshots)
+            )
+        )
+        timings.append(time.perf_counter() - start)
+    report("collect_listings", timings, driver, args.runs, found)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("recording", help="Recording (.json.gz) or HTML artifact")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per command")
+    parser.add_argument("--max-listings", type=int, default=1000)
+    parser.add_argument("--prune", action="store_true", help="collapse extracted cards")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    logger.setLevel(logging.INFO)
+
+    recording = load_recording(args.recording)
+    logger.info(
+        f"Replaying {len(recording.snapshots)} snapshots, "
+        f"{args.latency * 1000:.1f} ms/command, {args.runs} runs"
+    )
+    bench_extract(recording, args)
+    bench_collect(recording, args)
+
+
+if __name__ == "__main__":
+    main()
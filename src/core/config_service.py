@@ -2,8 +2,8 @@
 import logging
 import os
 import yaml
-from typing import Dict, Any, Optional
-from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Tuple
+from dataclasses import dataclass, field, replace
 from pathlib import Path
 
 
@@ -15,11 +15,75 @@ class BrowserConfig:
     headless: bool = True
     window_size: str = "1920,1080"
     user_agent: str = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36"
-    page_load_timeout: int = 30
-    implicit_wait: int = 10
+    profile: str = "balanced"
+    # Override the profile's values when set
+    page_load_timeout: Optional[int] = None
+    implicit_wait: Optional[float] = None
     enable_stealth: bool = True
 
 
+@dataclass
+class PerformanceProfile:
+    name: str = "balanced"
+    page_load_strategy: str = "eager"  # normal, eager or none
+    # Implicit waits stall every missed find_element(s); explicit waits
+    # (element_wait) are used where an element is actually expected
+    implicit_wait: float = 0
+    element_wait: float = 5
+    page_load_timeout: int = 30
+    script_timeout: int = 20
+    search_delay: Tuple[float, float] = (5, 7)
+    scroll_delay: Tuple[float, float] = (1, 2)
+    settle_delay: float = 3
+    # Pause after reloading with restored cookies
+    restore_delay: Tuple[float, float] = (2, 3)
+    # Extraction and page-state time allowed per scroll, on top of the delay
+    scroll_overhead: float = 5
+    # Watchdog deadlines by operation name; collect_listings scales with
+    # max_scrolls, see collect_deadline()
+    operation_deadlines: Dict[str, float] = field(
+        default_factory=lambda: {"search": 60}
+    )
+
+    def collect_deadline(self, max_scrolls: int) -> float:
+        """Worst-case collect_listings time for this many scrolls"""
+        per_scroll = max(self.scroll_delay) + self.scroll_overhead
+        return self.settle_delay + max_scrolls * per_scroll
+
+
+PERFORMANCE_PROFILES: Dict[str, PerformanceProfile] = {
+    "fast": PerformanceProfile(
+        name="fast",
+        page_load_strategy="eager",
+        implicit_wait=0,
+        element_wait=3,
+        page_load_timeout=20,
+        script_timeout=10,
+        search_delay=(2, 3),
+        scroll_delay=(0.5, 1),
+        settle_delay=1,
+        restore_delay=(1, 2),
+        scroll_overhead=3,
+        operation_deadlines={"search": 30},
+    ),
+    "balanced": PerformanceProfile(),
+    "cautious": PerformanceProfile(
+        name="cautious",
+        page_load_strategy="normal",
+        implicit_wait=2,
+        element_wait=10,
+        page_load_timeout=60,
+        script_timeout=30,
+        search_delay=(7, 10),
+        scroll_delay=(2, 4),
+        settle_delay=5,
+        restore_delay=(3, 5),
+        scroll_overhead=10,
+        operation_deadlines={"search": 120},
+    ),
+}
+
+
 @dataclass
 class ProxyConfig:
     enabled: bool = False
@@ -29,6 +93,7 @@ class ProxyConfig:
     password: Optional[str] = None
     country: str = "gb"
     city: str = "edinburgh"
+    cities: List[str] = field(default_factory=lambda: ["edinburgh"])
 
 
 @dataclass
@@ -36,6 +101,59 @@ class PathConfig:
     cookies_dir: str = "/app/cookies"
     logs_dir: str = "/app/logs"
     screenshots_dir: str = "/app/logs/screenshots"
+    images_dir: str = "/app/images"
+
+
+@dataclass
+class LoggingConfig:
+    level: str = "INFO"
+    format: str = "json"
+    file: str = "output.log"
+    rotation: str = "size"
+    max_bytes: int = 10 * 1024 * 1024
+    when: str = "midnight"
+    backup_count: int = 5
+    queue_size: int = 10000
+    debug_sample_rate: float = 1.0
+    debug_max_per_second: float = 50
+    save_screenshots_on_error: bool = True
+
+
+@dataclass
+class ArtifactConfig:
+    image_format: str = "webp"
+    quality: int = 60
+    capture_html: bool = True
+    sample_rate: float = 1.0
+    max_per_type: int = 20
+    retention_per_type: int = 50
+    queue_size: int = 16
+
+
+@dataclass
+class WatchdogConfig:
+    enabled: bool = True
+    operation_deadline: int = 90
+    max_rss_mb: int = 1500
+    max_cpu_percent: float = 95.0
+    cpu_strikes: int = 4
+    check_interval: int = 15
+
+
+@dataclass
+class ImageCacheConfig:
+    max_workers: int = 8
+    timeout: int = 15
+    thumbnail_size: int = 256
+    thumbnail_workers: int = 2
+    max_cache_bytes: int = 2 * 1024 * 1024 * 1024
+
+
+@dataclass
+class GeoConfig:
+    # Each shard: {location, proxy_city, radius_km}
+    shards: List[Dict[str, Any]] = field(default_factory=list)
+    max_workers: int = 3
 
 
 class ConfigService:
@@ -55,9 +173,17 @@ class ConfigService:
         self.browser = BrowserConfig()
         self.proxy = ProxyConfig()
         self.paths = PathConfig()
+        self.logging = LoggingConfig()
+        self.artifacts = ArtifactConfig()
+        self.watchdog = WatchdogConfig()
+        self.images = ImageCacheConfig()
+        self.geo = GeoConfig()
+        self.profiles: Dict[str, Dict[str, Any]] = {}
+        self.performance = PERFORMANCE_PROFILES["balanced"]
         
         self._load_config()
         self._load_env_vars()
+        self._resolve_profile()
         self._ensure_directories()
     
     def _load_config(self) -> None:
@@ -86,6 +212,40 @@ class ConfigService:
                 for key, value in config['paths'].items():
                     if hasattr(self.paths, key):
                         setattr(self.paths, key, value)
+            
+            # Apply logging config
+            if 'logging' in config:
+                for key, value in config['logging'].items():
+                    if hasattr(self.logging, key):
+                        setattr(self.logging, key, value)
+            
+            # Apply artifacts config
+            if 'artifacts' in config:
+                for key, value in config['artifacts'].items():
+                    if hasattr(self.artifacts, key):
+                        setattr(self.artifacts, key, value)
+            
+            # Apply watchdog config
+            if 'watchdog' in config:
+                for key, value in config['watchdog'].items():
+                    if hasattr(self.watchdog, key):
+                        setattr(self.watchdog, key, value)
+            
+            # Apply image cache config
+            if 'images' in config:
+                for key, value in config['images'].items():
+                    if hasattr(self.images, key):
+                        setattr(self.images, key, value)
+            
+            # Apply geo sharding config
+            if 'geo' in config:
+                for key, value in config['geo'].items():
+                    if hasattr(self.geo, key):
+                        setattr(self.geo, key, value)
+            
+            # Per-profile overrides, applied in _resolve_profile
+            if 'profiles' in config:
+                self.profiles = config['profiles'] or {}
         
         except Exception as e:
             logger.warning("[Config] Error loading: %s, using defaults", e)
@@ -96,14 +256,38 @@ class ConfigService:
         self.proxy.password = os.getenv("IPROYAL_PASS")
         self.proxy.country = os.getenv("PROXY_COUNTRY", self.proxy.country)
         
-        cities = os.getenv("PROXY_CITIES", self.proxy.city)
-        self.proxy.city = cities.split(',')[0] if cities else self.proxy.city
+        cities = os.getenv("PROXY_CITIES")
+        if cities:
+            self.proxy.cities = [c.strip() for c in cities.split(',') if c.strip()]
+        if self.proxy.cities:
+            self.proxy.city = self.proxy.cities[0]
         
         if os.getenv("USE_PROXY"):
             self.proxy.enabled = os.getenv("USE_PROXY", "false").lower() == "true"
+        
+        self.browser.profile = os.getenv("SCRAPER_PROFILE", self.browser.profile)
+    
+    def _resolve_profile(self) -> None:
+        name = self.browser.profile
+        if name not in PERFORMANCE_PROFILES:
+            logger.warning("[Config] Unknown profile %s, using balanced", name)
+            name = "balanced"
+        
+        overrides = {
+            key: value
+            for key, value in (self.profiles.get(name) or {}).items()
+            if hasattr(PERFORMANCE_PROFILES[name], key)
+        }
+        if self.browser.page_load_timeout is not None:
+            overrides['page_load_timeout'] = self.browser.page_load_timeout
+        if self.browser.implicit_wait is not None:
+            overrides['implicit_wait'] = self.browser.implicit_wait
+        
+        self.performance = replace(PERFORMANCE_PROFILES[name], **overrides)
+        logger.info("[Config] Performance profile: %s", name)
     
     def _ensure_directories(self) -> None:
-        for attr in ['cookies_dir', 'logs_dir', 'screenshots_dir']:
+        for attr in ['cookies_dir', 'logs_dir', 'screenshots_dir', 'images_dir']:
             path = getattr(self.paths, attr)
             Path(path).mkdir(parents=True, exist_ok=True)
     
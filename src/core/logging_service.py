@@ -0,0 +1,221 @@
+# src/core/logging_service.py
+"""
+Non-blocking logging: records are queued on the calling thread and
+written (console + rotating file) by a background listener thread
+"""
+
+import atexit
+import contextlib
+import contextvars
+import copy
+import datetime
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from typing import Dict, Iterator, Optional, Tuple
+
+from .config_service import ConfigService
+
+
+CONTEXT_FIELDS = ("query", "worker", "account", "proxy")
+
+_log_context: contextvars.ContextVar[Dict[str, str]] = contextvars.ContextVar(
+    "log_context", default={}
+)
+_listener: Optional["DropReportingListener"] = None
+
+
+@contextlib.contextmanager
+def log_context(**fields) -> Iterator[None]:
+    """Attach query/worker/account/proxy fields to every record in scope"""
+    token = _log_context.set({**_log_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _log_context.reset(token)
+
+
+class ContextFilter(logging.Filter):
+    """Stamps context fields onto records on the producing thread"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = _log_context.get()
+        for field in CONTEXT_FIELDS:
+            if not hasattr(record, field):
+                setattr(record, field, context.get(field))
+        return True
+
+
+class DebugSampler(logging.Filter):
+    """Samples and rate-limits DEBUG records per logger; other levels pass"""
+
+    def __init__(self, sample_rate: float = 1.0, max_per_second: float = 50):
+        super().__init__()
+        self.sample_rate = sample_rate
+        self.max_per_second = max_per_second
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG:
+            return True
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return False
+        if not self.max_per_second:
+            return True
+
+        # Token bucket per logger name
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.get(record.name, (self.max_per_second, now))
+            refill = (now - last) * self.max_per_second
+            tokens = min(self.max_per_second, tokens + refill)
+            allowed = tokens >= 1
+            self._buckets[record.name] = (tokens - 1 if allowed else tokens, now)
+        return allowed
+
+
+class JsonFormatter(logging.Formatter):
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.datetime.fromtimestamp(
+                record.created, datetime.timezone.utc
+            ).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        for field in CONTEXT_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """Never waits on a full queue; drops and counts instead"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge args now (they may be mutated later) but keep the traceback
+        # separate so the JSON formatter can emit it as its own field
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class DropReportingListener(logging.handlers.QueueListener):
+    """Writes a warning ahead of the next record whenever records were dropped"""
+
+    def __init__(self, queue_handler: NonBlockingQueueHandler, *handlers, **kwargs):
+        super().__init__(queue_handler.queue, *handlers, **kwargs)
+        self.queue_handler = queue_handler
+        self._reported = 0
+
+    def handle(self, record: logging.LogRecord) -> None:
+        self.report_dropped()
+        super().handle(record)
+
+    def report_dropped(self) -> None:
+        dropped = self.queue_handler.dropped
+        if dropped <= self._reported:
+            return
+        record = logging.LogRecord(
+            __name__,
+            logging.WARNING,
+            __file__,
+            0,
+            "[Logging] ⚠️ Dropped %s records on a full queue (%s this run)",
+            (dropped - self._reported, dropped),
+            None,
+        )
+        self._reported = dropped
+        super().handle(record)
+
+
+def setup_logging(config: ConfigService) -> "DropReportingListener":
+    """Route the root logger through a queue to console and file writers"""
+    global _listener
+    stop_logging()
+
+    settings = config.logging
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(logging.Formatter("%(message)s"))
+
+    log_path = os.path.join(config.paths.logs_dir, settings.file)
+    if settings.rotation == "time":
+        file_handler = logging.handlers.TimedRotatingFileHandler(
+            log_path,
+            when=settings.when,
+            backupCount=settings.backup_count,
+            encoding="utf-8",
+            delay=True,
+        )
+    else:
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_path,
+            maxBytes=settings.max_bytes,
+            backupCount=settings.backup_count,
+            encoding="utf-8",
+            delay=True,
+        )
+    if settings.format == "json":
+        file_handler.setFormatter(JsonFormatter())
+    else:
+        file_handler.setFormatter(logging.Formatter("%(message)s"))
+
+    queue_handler = NonBlockingQueueHandler(queue.Queue(maxsize=settings.queue_size))
+    queue_handler.addFilter(ContextFilter())
+    queue_handler.addFilter(
+        DebugSampler(settings.debug_sample_rate, settings.debug_max_per_second)
+    )
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(settings.level.upper())
+
+    _listener = DropReportingListener(
+        queue_handler, console, file_handler, respect_handler_level=True
+    )
+    _listener.start()
+    # Drain whatever is still queued when the process exits
+    atexit.register(stop_logging)
+    return _listener
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the writer thread"""
+    global _listener
+    if _listener:
+        _listener.stop()
+        # Drops after the last queued record would otherwise go unreported
+        _listener.report_dropped()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
@@ -1,6 +1,24 @@
 # src/scraper/__init__.py
 """Scraper package"""
 
+from .geo_sharded_search import GeoShard, GeoShardedSearch, ShardStats
+from .listing import Listing, ListingBatch
+from .listing_deduplicator import ListingDeduplicator
+from .listing_ranker import ListingRanker, PriceHistory, RankedListing
 from .marketplace_scraper import MarketplaceScraper
+from .page_state import PageState, PageStateClassifier
 
-__all__ = ['MarketplaceScraper']
\ No newline at end of file
+__all__ = [
+    'GeoShard',
+    'GeoShardedSearch',
+    'Listing',
+    'ListingBatch',
+    'ListingDeduplicator',
+    'ListingRanker',
+    'MarketplaceScraper',
+    'PageState',
+    'PageStateClassifier',
+    'PriceHistory',
+    'RankedListing',
+    'ShardStats',
+]
\ No newline at end of file
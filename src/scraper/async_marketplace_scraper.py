@@ -0,0 +1,283 @@
+# src/scraper/async_marketplace_scraper.py
+
+import asyncio
+import logging
+import random
+from typing import Dict, List, Optional
+
+from .browser_helper import COLLAPSE_CARDS_SCRIPT
+from .listing import Listing, parse_price_text
+from .listing_deduplicator import ListingDeduplicator
+from .marketplace_scraper import build_search_url
+from .page_state import PageState, PageStateClassifier
+from ..core.config_service import PERFORMANCE_PROFILES, PerformanceProfile
+from ..services.cdp_browser_service import CdpBrowser, CdpPage
+from ..services.circuit_breaker import CircuitBreaker
+
+logger = logging.getLogger(__name__)
+
+# Extracts every new card in one round trip, mirroring ElementExtractor.
+# Links are tagged once extracted so later passes skip them in-page.
+EXTRACT_LISTINGS_SCRIPT = """
+    const depth = arguments[0];
+    const results = [];
+    for (const link of document.querySelectorAll("a[href*='/marketplace/item/']")) {
+        if (link.dataset.aetosSeen) continue;
+
+        const label = link.getAttribute('aria-label');
+        const title = label ? label.trim() : (link.innerText || '').trim().split('\\n')[0];
+        if (!title) continue;
+        link.dataset.aetosSeen = '1';
+
+        let card = link;
+        for (let i = 0; i < depth && card.parentElement; i++) {
+            card = card.parentElement;
+        }
+
+        let priceText = null;
+        for (const el of card.querySelectorAll('*')) {
+            const own = Array.from(el.childNodes)
+                .filter(node => node.nodeType === Node.TEXT_NODE)
+                .map(node => node.textContent)
+                .join('');
+            if (own.includes('£') || own.includes('$')) {
+                priceText = el.innerText;
+                break;
+            }
+        }
+
+        let imageUrl = null;
+        for (const img of card.querySelectorAll('img')) {
+            if (img.src && img.src.includes('fbcdn.net')) {
+                imageUrl = img.src;
+                break;
+            }
+        }
+
+        const location = (card.innerText || '').split('\\n')
+            .find(line => /mile|km|away/i.test(line));
+
+        results.push({
+            url: link.href,
+            title: title,
+            price_text: priceText,
+            image_url: imageUrl,
+            location: location ? location.trim() : null
+        });
+    }
+    return results;
+"""
+
+PRUNE_SEEN_SCRIPT = (
+    "return (function() {"
+    + COLLAPSE_CARDS_SCRIPT
+    + "})(document.querySelectorAll('a[data-aetos-seen]'), arguments[0]);"
+)
+
+
+class AsyncMarketplaceScraper:
+    """
+    CDP counterpart of MarketplaceScraper: same search/collect interface,
+    but every call is a coroutine so one event loop can drive many tabs
+    """
+
+    def __init__(
+        self,
+        page: CdpPage,
+        deduplicator: Optional[ListingDeduplicator] = None,
+        breakers: Optional[List[CircuitBreaker]] = None,
+        prune_dom: bool = False,
+        profile: Optional[PerformanceProfile] = None,
+    ):
+        self.page = page
+        self.deduplicator = deduplicator
+        self.breakers = breakers or []
+        self.prune_dom = prune_dom
+        self.profile = profile or PERFORMANCE_PROFILES["balanced"]
+        self.classifier = PageStateClassifier()
+        self.page_state = PageState.UNKNOWN
+        self.base_url = "https://www.facebook.com/marketplace"
+
+    async def search(
+        self, query: str, location: Optional[str] = None, radius_km: Optional[int] = None
+    ) -> bool:
+        where = f" in {location}" if location else ""
+        logger.info(f"[AsyncScraper] Searching for: '{query}'{where}")
+
+        open_breakers = [b.name for b in self.breakers if not b.allow()]
+        if open_breakers:
+            logger.warning(
+                f"[AsyncScraper] ⏸️ Skipping search, breaker open: {open_breakers}"
+            )
+            return False
+
+        try:
+            await self.page.navigate(
+                build_search_url(self.base_url, query, location, radius_km),
+                timeout=self.profile.page_load_timeout,
+                strategy=self.profile.page_load_strategy,
+            )
+            await self._human_delay(*self.profile.search_delay)
+
+            state = await self._check_page_state()
+            if state.blocked:
+                logger.error(f"[AsyncScraper] ❌ Blocked: {state.value}")
+                return False
+
+            if "/marketplace/" not in await self.page.current_url():
+                logger.error("[AsyncScraper] ❌ Not on marketplace")
+                return False
+
+            for breaker in self.breakers:
+                breaker.record_success()
+
+            logger.info("[AsyncScraper] ✅ Search successful")
+            return True
+
+        except Exception as e:
+            logger.error(f"[AsyncScraper] ❌ Search failed: {e}")
+            for breaker in self.breakers:
+                breaker.record_failure(f"search error: {e}")
+            return False
+
+    async def collect_listings(
+        self, max_listings: int = 50, max_scrolls: int = 20
+    ) -> List[Listing]:
+
+        logger.info(f"[AsyncScraper] Collecting up to {max_listings} listings...")
+
+        listings = []
+        seen_urls = set()
+        scroll_attempts = 0
+        no_new_count = 0
+
+        await asyncio.sleep(self.profile.settle_delay)  # Initial page load
+
+        state = await self._check_page_state()
+        if state == PageState.EMPTY or state.blocked:
+            logger.warning(f"[AsyncScraper] No results to collect ({state.value})")
+            return []
+
+        while len(listings) < max_listings and scroll_attempts < max_scrolls:
+            scroll_attempts += 1
+
+            new_listings = await self._extract_visible_listings(seen_urls)
+
+            if new_listings:
+                listings.extend(new_listings)
+                logger.info(f"[AsyncScraper] Collected {len(listings)}/{max_listings}")
+                no_new_count = 0
+            else:
+                no_new_count += 1
+
+            if no_new_count >= 3:
+                break
+
+            await self.page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+            await self._human_delay(*self.profile.scroll_delay)
+
+            if (await self._check_page_state()).blocked:
+                logger.warning(
+                    f"[AsyncScraper] Stopped scrolling ({self.page_state.value})"
+                )
+                break
+
+        logger.info(f"[AsyncScraper] Collected {len(listings)} total")
+        return listings[:max_listings]
+
+    async def _extract_visible_listings(self, seen_urls: set) -> List[Listing]:
+
+        new_listings = []
+
+        try:
+            cards = await self.page.execute_script(EXTRACT_LISTINGS_SCRIPT, 3) or []
+
+            for card in cards:
+                url = card.get("url")
+                if not url or url in seen_urls:
+                    continue
+                seen_urls.add(url)
+
+                try:
+                    price, currency = parse_price_text(card.get("price_text"))
+                    listing = Listing(
+                        url=url,
+                        title=card.get("title"),
+                        price=price,
+                        currency=currency,
+                        image_url=card.get("image_url"),
+                        location=card.get("location"),
+                    )
+                except ValueError:
+                    continue
+
+                if self.deduplicator:
+                    duplicate_of = self.deduplicator.check(listing)
+                    if duplicate_of:
+                        if self.deduplicator.merge:
+                            continue
+                        listing.duplicate_of = duplicate_of
+
+                new_listings.append(listing)
+
+            if self.prune_dom and cards:
+                await self.page.execute_script(PRUNE_SEEN_SCRIPT, 3)
+        except Exception as e:
+            logger.error(f"[AsyncScraper] Error: {e}")
+
+        return new_listings
+
+    async def _check_page_state(self) -> PageState:
+        try:
+            signals = await self.page.execute_script(PageStateClassifier.PROBE_SCRIPT)
+        except Exception as e:
+            logger.debug(f"[AsyncScraper] Probe failed: {e}")
+            signals = None
+
+        self.page_state = (
+            self.classifier.classify_signals(signals) if signals else PageState.UNKNOWN
+        )
+        if self.page_state.blocked:
+            for breaker in self.breakers:
+                breaker.record_failure(self.page_state.value, severe=True)
+        return self.page_state
+
+    @staticmethod
+    async def _human_delay(min_seconds: float = 1, max_seconds: float = 3) -> None:
+        await asyncio.sleep(random.uniform(min_seconds, max_seconds))
+
+
+async def scrape_queries(
+    browser: CdpBrowser,
+    queries: List[str],
+    max_listings: int = 50,
+    cookies: Optional[List[Dict]] = None,
+    **scraper_kwargs,
+) -> Dict[str, List[Listing]]:
+    """Run each query in its own tab of one browser, concurrently"""
+    pages = [await browser.new_page() for _ in queries]
+    if cookies and pages:
+        # Tabs share the browser's cookie jar
+        await pages[0].set_cookies(cookies)
+
+    async def run(page: CdpPage, query: str) -> List[Listing]:
+        scraper = AsyncMarketplaceScraper(page, **scraper_kwargs)
+        try:
+            if not await scraper.search(query):
+                return []
+            return await scraper.collect_listings(max_listings=max_listings)
+        finally:
+            await page.close()
+
+    results = await asyncio.gather(
+        *(run(page, query) for page, query in zip(pages, queries)),
+        return_exceptions=True,
+    )
+
+    collected = {}
+    for query, result in zip(queries, results):
+        if isinstance(result, Exception):
+            logger.error(f"[AsyncScraper] ❌ '{query}' failed: {result}")
+            result = []
+        collected[query] = result
+    return collected
@@ -2,9 +2,38 @@
 import logging
 import random
 import time
+from typing import Dict, List, Optional
 
 logger = logging.getLogger(__name__)
 
+# Swap each card's subtree for an empty box of the same size, so images and
+# nodes are released while the scroll height (and infinite scroll) is kept
+COLLAPSE_CARDS_SCRIPT = """
+    let collapsed = 0;
+    for (const link of arguments[0]) {
+        let card = link;
+        for (let i = 0; i < arguments[1] && card.parentElement; i++) {
+            card = card.parentElement;
+        }
+        if (card.dataset.aetosPruned) continue;
+        const rect = card.getBoundingClientRect();
+        card.style.width = rect.width + 'px';
+        card.style.height = rect.height + 'px';
+        card.replaceChildren();
+        card.dataset.aetosPruned = '1';
+        collapsed++;
+    }
+    return collapsed;
+"""
+
+MEMORY_USAGE_SCRIPT = """
+    const memory = performance.memory || {};
+    return {
+        dom_nodes: document.getElementsByTagName('*').length,
+        js_heap_bytes: memory.usedJSHeapSize || null
+    };
+"""
+
 
 class BrowserHelper:
 
@@ -27,20 +56,16 @@ class BrowserHelper:
         except Exception as e:
             logger.debug(f"Scroll failed: {e}")
 
-    def save_screenshot(self, filepath: str) -> bool:
+    def collapse_cards(self, links: List, depth: int = 3) -> int:
         try:
-            self.driver.save_screenshot(filepath)
-            logger.info(f"Screenshot: {filepath}")
-            return True
+            return self.driver.execute_script(COLLAPSE_CARDS_SCRIPT, links, depth) or 0
         except Exception as e:
-            logger.error(f"Screenshot failed: {e}")
-            return False
+            logger.debug(f"Collapse failed: {e}")
+            return 0
 
-    def save_html(self, filepath: str) -> bool:
+    def memory_usage(self) -> Optional[Dict[str, int]]:
         try:
-            with open(filepath, "w", encoding="utf-8") as f:
-                f.write(self.driver.page_source)
-            return True
+            return self.driver.execute_script(MEMORY_USAGE_SCRIPT)
         except Exception as e:
-            logger.error(f"HTML save failed: {e}")
-            return False
+            logger.debug(f"Memory probe failed: {e}")
+            return None
@@ -0,0 +1,377 @@
+# src/scraper/driver_replay.py
+
+import gzip
+import json
+import logging
+import random
+import re
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from html.parser import HTMLParser
+from typing import Any, Dict, Iterator, List, Optional
+from urllib.parse import urljoin
+
+from selenium.common.exceptions import InvalidSelectorException, NoSuchElementException
+from selenium.webdriver.common.by import By
+
+from .browser_helper import COLLAPSE_CARDS_SCRIPT, MEMORY_USAGE_SCRIPT
+from .page_state import PageStateClassifier
+
+logger = logging.getLogger(__name__)
+
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr",
+}
+# Tags whose boundaries become line breaks in innerText
+BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "br", "dd", "div", "dl", "dt",
+    "figcaption", "figure", "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6",
+    "header", "hr", "li", "main", "nav", "ol", "p", "pre", "section", "table",
+    "tr", "ul",
+}
+HIDDEN_TAGS = {"head", "noscript", "script", "style", "template"}
+
+ATTR_CONTAINS_SELECTOR = re.compile(r"^(\w*)\[([\w-]+)\*=['\"]([^'\"]+)['\"]\]$")
+TEXT_CONTAINS_XPATH = re.compile(r"contains\(text\(\),\s*'([^']*)'\)")
+
+
+def _is_scroll(script: str) -> bool:
+    return "scrollTo" in script or "scrollBy" in script
+
+
+@dataclass
+class Snapshot:
+    url: str
+    html: str
+
+
+@dataclass
+class Recording:
+    """DOM snapshots of one page: index 0 after load, then one per scroll"""
+
+    snapshots: List[Snapshot] = field(default_factory=list)
+
+    def save(self, path: str) -> None:
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            json.dump({"snapshots": [asdict(s) for s in self.snapshots]}, f)
+        logger.info(f"[Replay] Saved {len(self.snapshots)} snapshots to {path}")
+
+    @classmethod
+    def load(cls, path: str) -> "Recording":
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls([Snapshot(**s) for s in data["snapshots"]])
+
+    @classmethod
+    def from_html(cls, url: str, html: str) -> "Recording":
+        return cls([Snapshot(url, html)])
+
+
+class RecordingDriver:
+    """
+    Wraps a live WebDriver and snapshots the DOM once per scroll step
+
+    Snapshots are taken lazily, on the first read after a navigation or
+    scroll, so they reflect the page after the scraper's own delays.
+    """
+
+    def __init__(self, driver):
+        self._driver = driver
+        self.recording = Recording()
+        self._dirty = False
+
+    def __getattr__(self, name: str):
+        return getattr(self._driver, name)
+
+    def get(self, url: str) -> None:
+        self._driver.get(url)
+        self.recording = Recording()
+        self._dirty = True
+
+    def execute_script(self, script: str, *args):
+        if _is_scroll(script):
+            result = self._driver.execute_script(script, *args)
+            self._dirty = True
+            return result
+        self._snapshot()
+        return self._driver.execute_script(script, *args)
+
+    def find_elements(self, by=By.ID, value: Optional[str] = None):
+        self._snapshot()
+        return self._driver.find_elements(by, value)
+
+    def find_element(self, by=By.ID, value: Optional[str] = None):
+        self._snapshot()
+        return self._driver.find_element(by, value)
+
+    def _snapshot(self) -> None:
+        if not self._dirty:
+            return
+        self._dirty = False
+        self.recording.snapshots.append(
+            Snapshot(self._driver.current_url, self._driver.page_source)
+        )
+
+
+class Node:
+    __slots__ = ("tag", "attrs", "children", "parent", "text")
+
+    def __init__(self, tag: Optional[str], attrs=None, parent=None, text=None):
+        self.tag = tag
+        self.attrs: Dict[str, str] = attrs or {}
+        self.children: List["Node"] = []
+        self.parent: Optional["Node"] = parent
+        self.text: Optional[str] = text
+
+    def iter_descendants(self) -> Iterator["Node"]:
+        stack = list(reversed(self.children))
+        while stack:
+            node = stack.pop()
+            if node.tag is not None:
+                yield node
+                stack.extend(reversed(node.children))
+
+    def own_first_text(self) -> str:
+        for child in self.children:
+            if child.tag is None:
+                return child.text
+        return ""
+
+    def inner_text(self) -> str:
+        parts: List[str] = []
+        self._collect_text(parts)
+        lines = (re.sub(r"\s+", " ", line).strip() for line in "".join(parts).split("\n"))
+        return "\n".join(line for line in lines if line)
+
+    def _collect_text(self, parts: List[str]) -> None:
+        for child in self.children:
+            if child.tag is None:
+                parts.append(child.text)
+            elif child.tag not in HIDDEN_TAGS:
+                block = child.tag in BLOCK_TAGS
+                if block:
+                    parts.append("\n")
+                child._collect_text(parts)
+                if block:
+                    parts.append("\n")
+
+
+class _TreeBuilder(HTMLParser):
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Node("#document")
+        self._stack = [self.root]
+
+    def handle_starttag(self, tag, attrs):
+        node = Node(tag, {k: v or "" for k, v in attrs}, self._stack[-1])
+        self._stack[-1].children.append(node)
+        if tag not in VOID_TAGS:
+            self._stack.append(node)
+
+    def handle_startendtag(self, tag, attrs):
+        node = Node(tag, {k: v or "" for k, v in attrs}, self._stack[-1])
+        self._stack[-1].children.append(node)
+
+    def handle_endtag(self, tag):
+        # Tolerate unclosed tags by popping to the nearest match
+        for i in range(len(self._stack) - 1, 0, -1):
+            if self._stack[i].tag == tag:
+                del self._stack[i:]
+                return
+
+    def handle_data(self, data):
+        parent = self._stack[-1]
+        parent.children.append(Node(None, parent=parent, text=data))
+
+
+def parse_html(html: str) -> Node:
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    return builder.root
+
+
+class ReplayElement:
+    """The slice of the WebElement API the scraper uses"""
+
+    def __init__(self, node: Node, driver: "ReplayDriver"):
+        self._node = node
+        self._driver = driver
+
+    @property
+    def tag_name(self) -> str:
+        return self._node.tag
+
+    @property
+    def text(self) -> str:
+        self._driver._command("text")
+        return self._node.inner_text()
+
+    def get_attribute(self, name: str) -> Optional[str]:
+        self._driver._command("get_attribute")
+        value = self._node.attrs.get(name)
+        # Like the DOM property, URLs come back absolute
+        if value is not None and name in ("href", "src"):
+            return urljoin(self._driver.current_url, value)
+        return value
+
+    def find_elements(self, by=By.ID, value: Optional[str] = None) -> List["ReplayElement"]:
+        self._driver._command("find_elements")
+        return self._driver._find(self._node, by, value)
+
+    def find_element(self, by=By.ID, value: Optional[str] = None) -> "ReplayElement":
+        self._driver._command("find_element")
+        found = self._driver._find(self._node, by, value)
+        if not found:
+            raise NoSuchElementException(f"No element for {by}={value}")
+        return found[0]
+
+
+class ReplayDriver:
+    """
+    Offline stand-in for a Chrome WebDriver that serves recorded snapshots
+
+    Scrolling advances to the next snapshot; every command can be delayed
+    to model chromedriver round trips. Supports the selectors and scripts
+    MarketplaceScraper, ElementExtractor and PageStateClassifier use.
+    """
+
+    def __init__(
+        self,
+        recording: Recording,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+    ):
+        if not recording.snapshots:
+            raise ValueError("Recording has no snapshots")
+        self.recording = recording
+        self.latency = latency
+        self.jitter = jitter
+        self.commands: Counter = Counter()
+        self.index = 0
+        self._trees: Dict[int, Node] = {}
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs) -> "ReplayDriver":
+        return cls(Recording.load(path), **kwargs)
+
+    @property
+    def current_url(self) -> str:
+        return self.recording.snapshots[self.index].url
+
+    @property
+    def page_source(self) -> str:
+        self._command("page_source")
+        return self.recording.snapshots[self.index].html
+
+    def get(self, url: str) -> None:
+        self._command("get")
+        self.index = 0
+        # Drop trees mutated by card collapsing
+        self._trees.clear()
+
+    def refresh(self) -> None:
+        self._command("refresh")
+
+    def execute_script(self, script: str, *args) -> Any:
+        self._command("execute_script")
+        if _is_scroll(script):
+            self.index = min(self.index + 1, len(self.recording.snapshots) - 1)
+            return None
+        if script == PageStateClassifier.PROBE_SCRIPT:
+            return self._probe()
+        if script == MEMORY_USAGE_SCRIPT:
+            nodes = sum(1 for _ in self._tree().iter_descendants())
+            return {"dom_nodes": nodes, "js_heap_bytes": None}
+        if script == COLLAPSE_CARDS_SCRIPT:
+            return self._collapse(*args)
+        return None
+
+    def find_elements(self, by=By.ID, value: Optional[str] = None) -> List[ReplayElement]:
+        self._command("find_elements")
+        return self._find(self._tree(), by, value)
+
+    def find_element(self, by=By.ID, value: Optional[str] = None) -> ReplayElement:
+        found = self.find_elements(by, value)
+        if not found:
+            raise NoSuchElementException(f"No element for {by}={value}")
+        return found[0]
+
+    def delete_all_cookies(self) -> None:
+        self._command("delete_all_cookies")
+
+    def add_cookie(self, cookie: Dict) -> None:
+        self._command("add_cookie")
+
+    def quit(self) -> None:
+        pass
+
+    def _command(self, name: str) -> None:
+        self.commands[name] += 1
+        if self.latency or self.jitter:
+            time.sleep(self.latency + random.uniform(0, self.jitter))
+
+    def _tree(self) -> Node:
+        if self.index not in self._trees:
+            self._trees[self.index] = parse_html(self.recording.snapshots[self.index].html)
+        return self._trees[self.index]
+
+    def _find(self, node: Node, by: str, value: str) -> List[ReplayElement]:
+        if by == By.XPATH and value == "..":
+            matches = [node.parent] if node.parent and node.parent.tag != "#document" else []
+        elif by == By.XPATH and value.startswith(".//*[") and TEXT_CONTAINS_XPATH.search(value):
+            # XPath 1.0 text() in contains() is the first text node only
+            needles = TEXT_CONTAINS_XPATH.findall(value)
+            matches = [
+                n
+                for n in node.iter_descendants()
+                if any(needle in n.own_first_text() for needle in needles)
+            ]
+        elif by == By.TAG_NAME:
+            matches = [n for n in node.iter_descendants() if n.tag == value]
+        elif by == By.CSS_SELECTOR and ATTR_CONTAINS_SELECTOR.match(value):
+            tag, attr, needle = ATTR_CONTAINS_SELECTOR.match(value).groups()
+            matches = [
+                n
+                for n in node.iter_descendants()
+                if (not tag or n.tag == tag) and needle in n.attrs.get(attr, "")
+            ]
+        else:
+            raise InvalidSelectorException(f"Replay does not support {by}={value}")
+        return [ReplayElement(n, self) for n in matches]
+
+    def _probe(self) -> Dict[str, Any]:
+        root = self._tree()
+        body = next((n for n in root.iter_descendants() if n.tag == "body"), root)
+        items = login_form = 0
+        for n in root.iter_descendants():
+            if n.tag == "a" and "/marketplace/item/" in n.attrs.get("href", ""):
+                items += 1
+            elif (n.tag == "input" and n.attrs.get("name") == "pass") or (
+                n.tag == "form" and "login" in n.attrs.get("action", "")
+            ):
+                login_form = True
+        return {
+            "url": self.current_url,
+            "items": items,
+            "login_form": bool(login_form),
+            "text": body.inner_text()[:3000],
+        }
+
+    @staticmethod
+    def _collapse(links: List[ReplayElement], depth: int = 3) -> int:
+        collapsed = 0
+        for link in links:
+            card = link._node
+            for _ in range(depth):
+                if card.parent and card.parent.tag != "#document":
+                    card = card.parent
+            if card.attrs.get("data-aetos-pruned"):
+                continue
+            card.children = []
+            card.attrs["data-aetos-pruned"] = "1"
+            collapsed += 1
+        return collapsed
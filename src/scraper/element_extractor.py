@@ -2,18 +2,20 @@
 
 
 import logging
-import re
-from typing import Any, Dict, Optional
+from decimal import Decimal
+from typing import Optional, Tuple
 
 from selenium.webdriver.common.by import By
 
+from .listing import Listing, parse_price_text
+
 logger = logging.getLogger(__name__)
 
 
 class ElementExtractor:
 
     @staticmethod
-    def extract_listing_data(element, url: str) -> Optional[Dict[str, Any]]:
+    def extract_listing_data(element, url: str) -> Optional[Listing]:
 
         try:
             # Get parent container
@@ -25,13 +27,16 @@ class ElementExtractor:
             if not title:
                 return None
 
-            return {
-                "url": url,
-                "title": title,
-                "price": ElementExtractor.extract_price(parent),
-                "image_url": ElementExtractor.extract_image(parent),
-                "location": ElementExtractor.extract_location(parent),
-            }
+            price, currency = ElementExtractor.extract_price_and_currency(parent)
+
+            return Listing(
+                url=url,
+                title=title,
+                price=price,
+                currency=currency,
+                image_url=ElementExtractor.extract_image(parent),
+                location=ElementExtractor.extract_location(parent),
+            )
         except:
             return None
 
@@ -51,7 +56,13 @@ class ElementExtractor:
             return None
 
     @staticmethod
-    def extract_price(element) -> Optional[float]:
+    def extract_price(element) -> Optional[Decimal]:
+        return ElementExtractor.extract_price_and_currency(element)[0]
+
+    @staticmethod
+    def extract_price_and_currency(
+        element,
+    ) -> Tuple[Optional[Decimal], Optional[str]]:
 
         try:
             text_elements = element.find_elements(
@@ -59,14 +70,13 @@ class ElementExtractor:
             )
 
             for text_elem in text_elements:
-                text = text_elem.text.strip()
-                price_match = re.search(r"[£$]?\s*(\d+(?:,\d{3})*(?:\.\d{2})?)", text)
-                if price_match:
-                    return float(price_match.group(1).replace(",", ""))
+                price, currency = parse_price_text(text_elem.text)
+                if price is not None:
+                    return price, currency
 
-            return None
+            return None, None
         except:
-            return None
+            return None, None
 
     @staticmethod
     def extract_image(element) -> Optional[str]:
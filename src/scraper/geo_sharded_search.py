@@ -0,0 +1,189 @@
+# src/scraper/geo_sharded_search.py
+
+import concurrent.futures
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from .listing import Listing
+from .marketplace_scraper import MarketplaceScraper
+from ..core.config_service import ConfigService
+from ..core.logging_service import log_context
+from ..services.artifact_service import ArtifactService
+from ..services.browser_service import BrowserService
+from ..services.facebook_service import FacebookService
+from ..services.proxy_service import ProxyService
+from ..services.session_service import SessionService
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class GeoShard:
+    location: str
+    proxy_city: Optional[str] = None
+    radius_km: Optional[int] = None
+
+    @property
+    def name(self) -> str:
+        return f"{self.location}@{self.radius_km}km" if self.radius_km else self.location
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "GeoShard":
+        return cls(
+            location=data["location"],
+            proxy_city=data.get("proxy_city"),
+            radius_km=data.get("radius_km"),
+        )
+
+
+@dataclass
+class ShardStats:
+    shard: str
+    collected: int = 0
+    unique: int = 0
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def duplicates(self) -> int:
+        return self.collected - self.unique
+
+    @property
+    def yield_rate(self) -> float:
+        """Share of this shard's listings no other shard had already found"""
+        return self.unique / self.collected if self.collected else 0.0
+
+
+# (shard, query, max_listings) -> listings
+ShardRunner = Callable[[GeoShard, str, int], List[Listing]]
+
+
+class GeoShardedSearch:
+    """
+    Fans one query out across locations, one browser per shard, and merges
+    the results into a single stream deduplicated by item ID
+    """
+
+    def __init__(
+        self,
+        shards: List[GeoShard],
+        run_shard: ShardRunner,
+        max_workers: Optional[int] = None,
+    ):
+        self.shards = shards
+        self.run_shard = run_shard
+        self.max_workers = max_workers or len(shards)
+        self.stats: Dict[str, ShardStats] = {}
+
+    @classmethod
+    def from_config(
+        cls, config: ConfigService, run_shard: ShardRunner
+    ) -> "GeoShardedSearch":
+        """Shards from geo.shards, each given a proxy.cities exit if unset"""
+        cities = config.proxy.cities
+        shards = []
+        for i, data in enumerate(config.geo.shards):
+            shard = GeoShard.from_dict(data)
+            if not shard.proxy_city and cities:
+                shard.proxy_city = cities[i % len(cities)]
+            shards.append(shard)
+        if not shards:
+            raise ValueError("No geo.shards configured")
+        return cls(shards, run_shard, max_workers=config.geo.max_workers)
+
+    def iter_search(self, query: str, max_listings: int = 50) -> Iterator[Listing]:
+        """Yield unique listings as each shard finishes"""
+        self.stats = {shard.name: ShardStats(shard.name) for shard in self.shards}
+        seen = set()
+
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="geo-shard"
+        ) as pool:
+            futures = {
+                pool.submit(self._timed_run, shard, query, max_listings): shard
+                for shard in self.shards
+            }
+            for future in concurrent.futures.as_completed(futures):
+                stats = self.stats[futures[future].name]
+                try:
+                    listings, stats.seconds = future.result()
+                except Exception as e:
+                    stats.error = str(e)
+                    logger.error(f"[GeoSearch] ❌ Shard {stats.shard} failed: {e}")
+                    continue
+
+                stats.collected = len(listings)
+                for listing in listings:
+                    if listing.key in seen:
+                        continue
+                    seen.add(listing.key)
+                    stats.unique += 1
+                    yield listing
+
+                logger.info(
+                    f"[GeoSearch] {stats.shard}: {stats.collected} collected, "
+                    f"{stats.unique} unique in {stats.seconds:.1f}s"
+                )
+
+        self.log_stats()
+
+    def search(self, query: str, max_listings: int = 50) -> List[Listing]:
+        return list(self.iter_search(query, max_listings))
+
+    def log_stats(self) -> None:
+        total = sum(s.unique for s in self.stats.values())
+        logger.info(f"[GeoSearch] {total} unique listings from {len(self.stats)} shards")
+        for stats in self.stats.values():
+            status = f"failed ({stats.error})" if stats.error else (
+                f"{stats.collected} collected, {stats.unique} unique, "
+                f"yield {stats.yield_rate:.0%}"
+            )
+            logger.info(f"[GeoSearch]   {stats.shard}: {status}")
+
+    def _timed_run(self, shard: GeoShard, query: str, max_listings: int):
+        start = time.monotonic()
+        listings = self.run_shard(shard, query, max_listings)
+        return listings or [], time.monotonic() - start
+
+
+def selenium_shard_runner(
+    config: ConfigService,
+    artifacts: Optional[ArtifactService] = None,
+    **scraper_kwargs,
+) -> ShardRunner:
+    """Runner that gives each shard its own proxy city, browser and session"""
+    scraper_kwargs.setdefault("profile", config.performance)
+
+    def run(shard: GeoShard, query: str, max_listings: int) -> List[Listing]:
+        proxy_service = (
+            ProxyService(city=shard.proxy_city, session_key=shard.name)
+            if config.proxy.enabled
+            else None
+        )
+        # Xvfb checks and Chrome launches (which clear/restore proxy env
+        # vars process-wide) are not safe to run side by side
+        with BrowserService.launch_lock:
+            browser = BrowserService(config, proxy_service, artifacts)
+            try:
+                browser.get_driver()
+            except Exception:
+                browser.quit()
+                raise
+        facebook = FacebookService(config, browser, SessionService(config))
+
+        with browser, log_context(
+            query=query, worker=f"shard-{shard.name}", proxy=shard.proxy_city
+        ):
+            if not facebook.restore_session():
+                raise RuntimeError("no valid session")
+
+            scraper = MarketplaceScraper(
+                browser.get_driver(), artifacts=artifacts, **scraper_kwargs
+            )
+            if not scraper.search(query, shard.location, shard.radius_km):
+                raise RuntimeError(f"search failed ({scraper.page_state.value})")
+            return scraper.collect_listings(max_listings=max_listings)
+
+    return run
@@ -0,0 +1,132 @@
+# src/scraper/listing.py
+
+import csv
+import re
+import sys
+from dataclasses import dataclass, fields
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+def parse_item_id(url: str) -> Optional[str]:
+    match = re.search(r"/marketplace/item/(\d+)", url or "")
+    return match.group(1) if match else None
+
+
+def parse_price(value: Any) -> Optional[Decimal]:
+    if value is None or value == "":
+        return None
+    if isinstance(value, Decimal):
+        return value
+    try:
+        # str() first so floats keep their printed value, not binary noise
+        return Decimal(str(value).replace(",", "").strip())
+    except InvalidOperation:
+        raise ValueError(f"Invalid price: {value!r}")
+
+
+def parse_price_text(text: str) -> Tuple[Optional[Decimal], Optional[str]]:
+    """Parse card text like '£1,200' into (Decimal('1200'), '£')"""
+    price_match = re.search(r"([£$])?\s*(\d+(?:,\d{3})*(?:\.\d{2})?)", text or "")
+    if not price_match:
+        return None, None
+    return parse_price(price_match.group(2)), price_match.group(1)
+
+
+@dataclass(slots=True)
+class Listing:
+    url: str
+    title: str
+    item_id: Optional[str] = None
+    price: Optional[Decimal] = None
+    currency: Optional[str] = None
+    image_url: Optional[str] = None
+    location: Optional[str] = None
+    duplicate_of: Optional[str] = None
+    image_sha: Optional[str] = None
+
+    def __post_init__(self):
+        if not self.url:
+            raise ValueError("Listing requires a url")
+        if not self.title:
+            raise ValueError("Listing requires a title")
+
+        if self.item_id is None:
+            self.item_id = parse_item_id(self.url)
+        self.price = parse_price(self.price)
+
+        # Locations and currencies repeat heavily across a batch
+        if self.location:
+            self.location = sys.intern(self.location)
+        if self.currency:
+            self.currency = sys.intern(self.currency)
+
+    @property
+    def key(self) -> str:
+        return self.item_id or self.url
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Listing":
+        return cls(**{f.name: data.get(f.name) for f in fields(cls) if f.name in data})
+
+
+LISTING_COLUMNS = tuple(f.name for f in fields(Listing))
+
+
+class ListingBatch:
+    """Column-oriented store for large listing result sets"""
+
+    def __init__(self, listings: Iterable[Listing] = ()):
+        self._columns: Dict[str, List[Any]] = {name: [] for name in LISTING_COLUMNS}
+        self.extend(listings)
+
+    def __len__(self) -> int:
+        return len(self._columns["url"])
+
+    def __iter__(self) -> Iterator[Listing]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def __getitem__(self, index: int) -> Listing:
+        return Listing(**{name: self._columns[name][index] for name in LISTING_COLUMNS})
+
+    def append(self, listing: Listing) -> None:
+        for name in LISTING_COLUMNS:
+            self._columns[name].append(getattr(listing, name))
+
+    def extend(self, listings: Iterable[Listing]) -> None:
+        for listing in listings:
+            self.append(listing)
+
+    def column(self, name: str) -> List[Any]:
+        return self._columns[name]
+
+    def to_csv(self, filepath: str) -> None:
+        with open(filepath, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(LISTING_COLUMNS)
+            writer.writerows(zip(*(self._columns[name] for name in LISTING_COLUMNS)))
+
+    def to_arrow(self):
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError("pyarrow is required for Arrow/Parquet export")
+
+        schema = pa.schema(
+            [
+                pa.field(name, pa.decimal128(12, 2) if name == "price" else pa.string())
+                for name in LISTING_COLUMNS
+            ]
+        )
+        return pa.Table.from_pydict(
+            {name: self._columns[name] for name in LISTING_COLUMNS}, schema=schema
+        )
+
+    def to_parquet(self, filepath: str, compression: str = "zstd") -> None:
+        import pyarrow.parquet as pq
+
+        pq.write_table(self.to_arrow(), filepath, compression=compression)
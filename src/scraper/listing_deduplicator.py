@@ -0,0 +1,208 @@
+# src/scraper/listing_deduplicator.py
+
+import logging
+import random
+import re
+import zlib
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from .listing import Listing
+
+logger = logging.getLogger(__name__)
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+class ListingDeduplicator:
+    """
+    Flags reposted listings by near-duplicate title (MinHash + LSH)
+    and, optionally, by perceptual image hash.
+
+    Signed CDN image URLs change on every scrape, so image_hasher only
+    helps with stable URLs; for reposts, run check_images() once the
+    images have been fetched (e.g. with ImageCacheService.listing_hash).
+    """
+
+    def __init__(
+        self,
+        num_perm: int = 64,
+        bands: int = 16,
+        threshold: float = 0.8,
+        shingle_size: int = 4,
+        image_hasher: Optional[Callable[[str], Optional[int]]] = None,
+        image_distance: int = 6,
+        merge: bool = False,
+        seed: int = 1,
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.image_hasher = image_hasher
+        self.image_distance = image_distance
+        self.merge = merge
+
+        rng = random.Random(seed)
+        self._perms = [
+            (rng.randint(1, _MERSENNE_PRIME - 1), rng.randint(0, _MERSENNE_PRIME - 1))
+            for _ in range(num_perm)
+        ]
+
+        self._signatures: Dict[str, Tuple[int, ...]] = {}
+        self._title_buckets: Dict[Tuple[int, bytes], Set[str]] = defaultdict(set)
+        self._image_hashes: Dict[str, int] = {}
+        # 64-bit image hashes split into 8 byte-wide bands: any two hashes
+        # within Hamming distance 7 share at least one band exactly
+        self._image_buckets: Dict[Tuple[int, int], Set[str]] = defaultdict(set)
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def check(self, listing: Listing) -> Optional[str]:
+        """Return the key of the listing this one duplicates, else index it"""
+        key = listing.key
+        if key in self._signatures:
+            # Seen before (re-poll, overlapping shard): the same listing,
+            # not a repost of another one
+            return None
+
+        signature = self.signature(listing.title)
+        image_hash = self._hash_image(listing.image_url)
+
+        duplicate_of = self._match_title(signature) or self._match_image(image_hash)
+        if duplicate_of:
+            logger.info(f"[Dedup] {key} duplicates {duplicate_of}")
+            return duplicate_of
+
+        self._index(key, signature, image_hash)
+        return None
+
+    def check_images(
+        self,
+        listings: List[Listing],
+        image_hash: Callable[[Listing], Optional[int]],
+    ) -> List[Listing]:
+        """
+        Second pass after images are fetched: flag listings whose image
+        matches an earlier listing's, index the rest; returns those flagged
+        """
+        flagged = []
+        for listing in listings:
+            key = listing.key
+            if listing.duplicate_of or key in self._image_hashes:
+                continue
+            try:
+                hashed = image_hash(listing)
+            except Exception as e:
+                logger.debug(f"[Dedup] Image hash failed: {e}")
+                continue
+            if hashed is None:
+                continue
+
+            duplicate_of = self._match_image(hashed)
+            if duplicate_of:
+                logger.info(f"[Dedup] {key} image duplicates {duplicate_of}")
+                listing.duplicate_of = duplicate_of
+                flagged.append(listing)
+                continue
+            self._index_image(key, hashed)
+        return flagged
+
+    def signature(self, title: str) -> Tuple[int, ...]:
+        shingles = self._shingles(title)
+        if not shingles:
+            return tuple([_MAX_HASH] * self.num_perm)
+
+        hashes = [zlib.crc32(s.encode("utf-8")) for s in shingles]
+        return tuple(
+            min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+            for a, b in self._perms
+        )
+
+    @staticmethod
+    def similarity(sig_a: Tuple[int, ...], sig_b: Tuple[int, ...]) -> float:
+        matches = sum(1 for a, b in zip(sig_a, sig_b) if a == b)
+        return matches / len(sig_a)
+
+    def _shingles(self, title: str) -> Set[str]:
+        normalized = " ".join(re.findall(r"[a-z0-9]+", title.lower()))
+        if not normalized:
+            return set()
+        if len(normalized) <= self.shingle_size:
+            return {normalized}
+        return {
+            normalized[i : i + self.shingle_size]
+            for i in range(len(normalized) - self.shingle_size + 1)
+        }
+
+    def _title_bands(self, signature: Tuple[int, ...]) -> List[Tuple[int, bytes]]:
+        bands = []
+        for band in range(self.bands):
+            chunk = signature[band * self.rows : (band + 1) * self.rows]
+            bands.append((band, b"".join(v.to_bytes(4, "big") for v in chunk)))
+        return bands
+
+    def _match_title(self, signature: Tuple[int, ...]) -> Optional[str]:
+        if signature[0] == _MAX_HASH:
+            return None
+
+        candidates: Set[str] = set()
+        for band in self._title_bands(signature):
+            candidates.update(self._title_buckets.get(band, ()))
+
+        best_key, best_score = None, 0.0
+        for candidate in candidates:
+            score = self.similarity(signature, self._signatures[candidate])
+            if score >= self.threshold and score > best_score:
+                best_key, best_score = candidate, score
+        return best_key
+
+    def _hash_image(self, image_url: Optional[str]) -> Optional[int]:
+        if not self.image_hasher or not image_url:
+            return None
+        try:
+            return self.image_hasher(image_url)
+        except Exception as e:
+            logger.debug(f"[Dedup] Image hash failed: {e}")
+            return None
+
+    @staticmethod
+    def _image_bands(image_hash: int) -> List[Tuple[int, int]]:
+        return [(band, (image_hash >> (band * 8)) & 0xFF) for band in range(8)]
+
+    def _match_image(self, image_hash: Optional[int]) -> Optional[str]:
+        if image_hash is None:
+            return None
+
+        candidates: Set[str] = set()
+        for band in self._image_bands(image_hash):
+            candidates.update(self._image_buckets.get(band, ()))
+
+        best_key, best_distance = None, self.image_distance + 1
+        for candidate in candidates:
+            distance = bin(image_hash ^ self._image_hashes[candidate]).count("1")
+            if distance < best_distance:
+                best_key, best_distance = candidate, distance
+        return best_key
+
+    def _index(
+        self, key: str, signature: Tuple[int, ...], image_hash: Optional[int]
+    ) -> None:
+        self._signatures[key] = signature
+        if signature[0] != _MAX_HASH:
+            for band in self._title_bands(signature):
+                self._title_buckets[band].add(key)
+
+        if image_hash is not None:
+            self._index_image(key, image_hash)
+
+    def _index_image(self, key: str, image_hash: int) -> None:
+        self._image_hashes[key] = image_hash
+        for band in self._image_bands(image_hash):
+            self._image_buckets[band].add(key)
@@ -0,0 +1,223 @@
+# src/scraper/listing_ranker.py
+
+import json
+import logging
+import math
+import os
+import re
+import statistics
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .listing import Listing
+
+logger = logging.getLogger(__name__)
+
+
+def tokenize(text: str) -> List[str]:
+    return re.findall(r"[a-z0-9]+", (text or "").lower())
+
+
+class PriceHistory:
+    """
+    Bounded per-query price samples, optionally persisted as JSON
+
+    Samples are keyed by listing, so a listing that stays up across many
+    polls is counted once rather than once per poll.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_size: int = 500):
+        self.path = path
+        self.max_size = max_size
+        self._prices: Dict[str, "OrderedDict[str, float]"] = {}
+        self.load()
+
+    def load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            for query, prices in data.items():
+                if isinstance(prices, list):
+                    # Older files stored bare prices without listing keys
+                    prices = {f"legacy-{i}": p for i, p in enumerate(prices)}
+                self._prices[query] = OrderedDict(
+                    list(prices.items())[-self.max_size:]
+                )
+            logger.info(f"[Ranker] Loaded price history for {len(data)} queries")
+        except Exception as e:
+            logger.warning(f"[Ranker] Failed to load price history: {e}")
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        try:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({q: dict(p) for q, p in self._prices.items()}, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning(f"[Ranker] Failed to save price history: {e}")
+
+    def add(self, query: str, prices: Dict[str, float]) -> None:
+        """Record listing key -> price; keys already sampled are skipped"""
+        samples = self._prices.setdefault(self._key(query), OrderedDict())
+        for key, price in prices.items():
+            if key in samples:
+                continue
+            samples[key] = price
+            if len(samples) > self.max_size:
+                samples.popitem(last=False)
+
+    def stats(self, query: str) -> Optional[Tuple[int, float, float]]:
+        """Return (count, mean, stdev) for the query, or None if unknown"""
+        samples = self._prices.get(self._key(query))
+        if not samples:
+            return None
+        prices = list(samples.values())
+        mean = statistics.fmean(prices)
+        stdev = statistics.pstdev(prices, mu=mean) if len(prices) > 1 else 0.0
+        return len(prices), mean, stdev
+
+    @staticmethod
+    def _key(query: str) -> str:
+        return " ".join(tokenize(query))
+
+
+@dataclass
+class RankedListing:
+    listing: Listing
+    relevance: float
+    price_z: Optional[float]
+    underpriced: bool
+    score: float
+
+
+class ListingRanker:
+    """
+    Scores a batch of listings against the search query and flags
+    listings priced well below the query's price history.
+    """
+
+    def __init__(
+        self,
+        history: Optional[PriceHistory] = None,
+        min_relevance: float = 0.5,
+        underpriced_z: float = -1.0,
+        min_price_ratio: Optional[float] = 0.3,
+        min_history: int = 10,
+        deal_weight: float = 0.1,
+        exclude_terms: Iterable[str] = (),
+    ):
+        self.history = history or PriceHistory()
+        self.min_relevance = min_relevance
+        self.underpriced_z = underpriced_z
+        self.min_price_ratio = min_price_ratio
+        self.min_history = min_history
+        self.deal_weight = deal_weight
+        self.exclude_terms = set(tokenize(" ".join(exclude_terms)))
+
+    def rank(
+        self, query: str, listings: List[Listing], record: bool = True
+    ) -> List[RankedListing]:
+        if not listings:
+            return []
+
+        relevances = self.relevance(query, [listing.title for listing in listings])
+        stats = self.history.stats(query)
+
+        ranked = []
+        for listing, relevance in zip(listings, relevances):
+            price_z = self._price_z(listing.price, stats)
+            # A fraction of the usual price is more likely a placeholder
+            # than a genuine deal; a z-score cutoff would also drop real
+            # deals whenever the history is narrow
+            plausible = price_z is not None and (
+                self.min_price_ratio is None
+                or float(listing.price) >= self.min_price_ratio * stats[1]
+            )
+            underpriced = (
+                plausible
+                and relevance >= self.min_relevance
+                and price_z <= self.underpriced_z
+            )
+            deal_bonus = max(-price_z, 0.0) if plausible else 0.0
+            ranked.append(
+                RankedListing(
+                    listing=listing,
+                    relevance=relevance,
+                    price_z=price_z,
+                    underpriced=underpriced,
+                    score=relevance * (1 + self.deal_weight * deal_bonus),
+                )
+            )
+
+        ranked.sort(key=lambda r: r.score, reverse=True)
+
+        if record:
+            # Only relevant, non-duplicate prices feed the history so
+            # accessories and reposts don't drag the baseline around
+            self.history.add(
+                query,
+                {
+                    r.listing.key: float(r.listing.price)
+                    for r in ranked
+                    if r.listing.price
+                    and r.relevance >= self.min_relevance
+                    and not r.listing.duplicate_of
+                },
+            )
+
+        underpriced_count = sum(1 for r in ranked if r.underpriced)
+        logger.info(
+            f"[Ranker] Ranked {len(ranked)} listings for '{query}' "
+            f"({underpriced_count} underpriced)"
+        )
+        return ranked
+
+    def relevance(self, query: str, titles: List[str]) -> List[float]:
+        """Blend query-term coverage with TF-IDF cosine over the batch"""
+        query_terms = set(tokenize(query))
+        if not query_terms:
+            return [0.0] * len(titles)
+
+        docs = [Counter(tokenize(title)) for title in titles]
+        doc_freq = Counter(term for doc in docs for term in doc)
+        n_docs = len(docs)
+        idf = {
+            term: math.log((1 + n_docs) / (1 + doc_freq[term])) + 1
+            for term in query_terms.union(doc_freq)
+        }
+        query_norm = math.sqrt(sum(idf[t] ** 2 for t in query_terms))
+
+        scores = []
+        for doc in docs:
+            if not doc:
+                scores.append(0.0)
+                continue
+
+            weights = {term: count * idf[term] for term, count in doc.items()}
+            norm = math.sqrt(sum(w * w for w in weights.values()))
+            matched = query_terms.intersection(doc)
+
+            coverage = len(matched) / len(query_terms)
+            cosine = sum(weights[t] * idf[t] for t in matched) / (norm * query_norm)
+
+            score = 0.5 * coverage + 0.5 * cosine
+            if self.exclude_terms.intersection(doc):
+                score *= 0.5
+            scores.append(score)
+
+        return scores
+
+    def _price_z(
+        self, price: Any, stats: Optional[Tuple[int, float, float]]
+    ) -> Optional[float]:
+        if not price or not stats:
+            return None
+        count, mean, stdev = stats
+        if count < self.min_history or stdev == 0:
+            return None
+        return (float(price) - mean) / stdev
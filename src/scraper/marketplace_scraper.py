@@ -2,57 +2,149 @@
 
 import logging
 import time
-from typing import Dict, List
+from typing import Any, Dict, List, Optional
 
 from selenium.webdriver.common.by import By
 
 from .browser_helper import BrowserHelper
 from .element_extractor import ElementExtractor
+from .listing import Listing
+from .listing_deduplicator import ListingDeduplicator
+from .page_state import PageState, PageStateClassifier
+from ..core.config_service import PERFORMANCE_PROFILES, PerformanceProfile
+from ..services.artifact_service import ArtifactService
+from ..services.circuit_breaker import CircuitBreaker
 
 logger = logging.getLogger(__name__)
 
 
+def build_search_url(
+    base_url: str,
+    query: str,
+    location: Optional[str] = None,
+    radius_km: Optional[int] = None,
+) -> str:
+    """Marketplace search URL, optionally pinned to a location slug/radius"""
+    if location:
+        base_url = f"{base_url}/{location}"
+    url = f"{base_url}/search/?query={query}"
+    if radius_km:
+        url += f"&radius={radius_km}"
+    return url
+
+
 class MarketplaceScraper:
 
-    def __init__(self, driver):
+    def __init__(
+        self,
+        driver,
+        deduplicator: Optional[ListingDeduplicator] = None,
+        breakers: Optional[List[CircuitBreaker]] = None,
+        prune_dom: bool = False,
+        artifacts: Optional[ArtifactService] = None,
+        profile: Optional[PerformanceProfile] = None,
+    ):
         self.driver = driver
+        self.deduplicator = deduplicator
+        # Breakers for the account and proxy this scraper runs on
+        self.breakers = breakers or []
+        # Collapse cards once extracted so deep scrolls keep memory flat
+        self.prune_dom = prune_dom
+        self.memory_stats: Dict[str, Any] = {}
+        self.artifacts = artifacts
+        # Delays between page actions
+        self.profile = profile or PERFORMANCE_PROFILES["balanced"]
         self.browser = BrowserHelper(driver)
+        # Bumped by set_driver so operations started on an old driver stop
+        self.generation = 0
+        self.classifier = PageStateClassifier()
+        self.page_state = PageState.UNKNOWN
         self.base_url = "https://www.facebook.com/marketplace"
 
-    def search(self, query: str) -> bool:
-        logger.info(f"[Scraper] Searching for: '{query}'")
+    def set_driver(self, driver) -> None:
+        """
+        Point at a replacement driver, e.g. after a watchdog restart
+
+        An operation abandoned on the old driver (its thread outlives the
+        watchdog deadline) keeps its own BrowserHelper, so it never touches
+        the new driver, and stops at its next step.
+        """
+        self.driver = driver
+        self.browser = BrowserHelper(driver)
+        self.generation += 1
+
+    def search(
+        self, query: str, location: Optional[str] = None, radius_km: Optional[int] = None
+    ) -> bool:
+        where = f" in {location}" if location else ""
+        logger.info(f"[Scraper] Searching for: '{query}'{where}")
 
+        open_breakers = [b.name for b in self.breakers if not b.allow()]
+        if open_breakers:
+            logger.warning(f"[Scraper] ⏸️ Skipping search, breaker open: {open_breakers}")
+            return False
+
+        browser = self.browser
+        generation = self.generation
         try:
-            search_url = f"{self.base_url}/search/?query={query}"
-            self.driver.get(search_url)
-            self.browser.human_delay(5, 7)
+            search_url = build_search_url(self.base_url, query, location, radius_km)
+            browser.driver.get(search_url)
+            browser.human_delay(*self.profile.search_delay)
+            if generation != self.generation:
+                logger.warning("[Scraper] Driver replaced, abandoning search")
+                return False
+
+            state = self._check_page_state(browser)
+            if state.blocked:
+                logger.error(f"[Scraper] ❌ Blocked: {state.value}")
+                return False
 
-            if "/marketplace/" not in self.driver.current_url:
+            if "/marketplace/" not in browser.driver.current_url:
                 logger.error(f"[Scraper] ❌ Not on marketplace")
                 return False
 
+            for breaker in self.breakers:
+                breaker.record_success()
+
             logger.info("[Scraper] ✅ Search successful")
             return True
 
         except Exception as e:
             logger.error(f"[Scraper] ❌ Search failed: {e}")
+            for breaker in self.breakers:
+                breaker.record_failure(f"search error: {e}")
             return False
 
-    def collect_listings(self, max_listings: int = 50) -> List[Dict]:
+    def collect_listings(
+        self, max_listings: int = 50, max_scrolls: int = 20
+    ) -> List[Listing]:
 
         logger.info(f"[Scraper] Collecting up to {max_listings} listings...")
 
+        # One driver for the whole operation, even if set_driver swaps it
+        browser = self.browser
+        generation = self.generation
         listings = []
         seen_urls = set()
         scroll_attempts = 0
         no_new_count = 0
+        self.memory_stats = {"dom_nodes": 0, "js_heap_bytes": 0, "pruned_cards": 0}
+
+        time.sleep(self.profile.settle_delay)  # Initial page load
 
-        time.sleep(3)  # Initial page load
+        state = self._check_page_state(browser)
+        if state == PageState.EMPTY or state.blocked:
+            logger.warning(f"[Scraper] No results to collect ({state.value})")
+            return []
 
-        while len(listings) < max_listings and scroll_attempts < 20:
+        while len(listings) < max_listings and scroll_attempts < max_scrolls:
+            if generation != self.generation:
+                logger.warning("[Scraper] Driver replaced, abandoning collection")
+                return []
             scroll_attempts += 1
 
-            new_listings = self._extract_visible_listings(seen_urls)
+            new_listings = self._extract_visible_listings(seen_urls, browser)
+            self._sample_memory(browser)
 
             if new_listings:
                 listings.extend(new_listings)
@@ -64,39 +156,85 @@ class MarketplaceScraper:
             if no_new_count >= 3:
                 break
 
-            self.browser.scroll_down()
-            self.browser.human_delay(1, 2)
+            browser.scroll_down()
+            browser.human_delay(*self.profile.scroll_delay)
+
+            if self._check_page_state(browser).blocked:
+                logger.warning(f"[Scraper] Stopped scrolling ({self.page_state.value})")
+                break
 
         logger.info(f"[Scraper] Collected {len(listings)} total")
+        logger.info(
+            f"[Scraper] Peak DOM nodes: {self.memory_stats['dom_nodes']}, "
+            f"peak JS heap: {self.memory_stats['js_heap_bytes'] / 1e6:.1f} MB, "
+            f"pruned cards: {self.memory_stats['pruned_cards']}"
+        )
         return listings[:max_listings]
 
-    def _extract_visible_listings(self, seen_urls: set) -> List[Dict]:
-
+    def _sample_memory(self, browser: BrowserHelper) -> None:
+        usage = browser.memory_usage() or {}
+        for key in ("dom_nodes", "js_heap_bytes"):
+            self.memory_stats[key] = max(self.memory_stats[key], usage.get(key) or 0)
+
+    def _check_page_state(self, browser: Optional[BrowserHelper] = None) -> PageState:
+        driver = (browser or self.browser).driver
+        self.page_state = self.classifier.classify(driver)
+        if self.page_state.blocked:
+            for breaker in self.breakers:
+                breaker.record_failure(self.page_state.value, severe=True)
+            if self.artifacts:
+                self.artifacts.capture(driver, self.page_state.value)
+        return self.page_state
+
+    def _extract_visible_listings(
+        self, seen_urls: set, browser: Optional[BrowserHelper] = None
+    ) -> List[Listing]:
+
+        browser = browser or self.browser
         new_listings = []
+        done_links = []
 
         try:
-            listing_links = self.driver.find_elements(
+            listing_links = browser.driver.find_elements(
                 By.CSS_SELECTOR, "a[href*='/marketplace/item/']"
             )
 
             for link in listing_links:
                 try:
                     url = link.get_attribute("href")
-                    if not url or url in seen_urls:
+                    if not url:
+                        continue
+                    if url in seen_urls:
+                        done_links.append(link)
                         continue
 
                     listing = ElementExtractor.extract_listing_data(link, url)
-                    if listing:
-                        new_listings.append(listing)
-                        seen_urls.add(url)
+                    if not listing:
+                        continue
+
+                    seen_urls.add(url)
+                    done_links.append(link)
+                    if self.deduplicator:
+                        duplicate_of = self.deduplicator.check(listing)
+                        if duplicate_of:
+                            if self.deduplicator.merge:
+                                continue
+                            listing.duplicate_of = duplicate_of
+
+                    new_listings.append(listing)
                 except:
                     continue
+
+            if self.prune_dom and done_links:
+                self.memory_stats["pruned_cards"] += browser.collapse_cards(
+                    done_links
+                )
         except Exception as e:
             logger.error(f"[Scraper] Error: {e}")
 
         return new_listings
 
-    def print_listings(self, listings: List[Dict], limit: int = 3) -> None:
+    def print_listings(self, listings: List[Listing], limit: int = 3) -> None:
         """Print formatted listings"""
         logger.info("\n" + "=" * 80)
         logger.info(f" FOUND {len(listings)} LISTINGS")
@@ -104,13 +242,15 @@ class MarketplaceScraper:
 
         for i, listing in enumerate(listings[:limit], 1):
             price = (
-                f"£{listing['price']:.0f}" if listing.get("price") else "Price unknown"
+                f"{listing.currency or '£'}{listing.price:.0f}"
+                if listing.price
+                else "Price unknown"
             )
-            location = f" - {listing['location']}" if listing.get("location") else ""
+            location = f" - {listing.location}" if listing.location else ""
 
-            logger.info(f"\n{i}. {listing['title']}")
+            logger.info(f"\n{i}. {listing.title}")
             logger.info(f"    {price}{location}")
-            logger.info(f"    {listing['url']}")
+            logger.info(f"    {listing.url}")
 
         if len(listings) > limit:
             logger.info(f"\n... and {len(listings) - limit} more")
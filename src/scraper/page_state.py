@@ -0,0 +1,99 @@
+# src/scraper/page_state.py
+
+import logging
+from enum import Enum
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PageState(Enum):
+    RESULTS = "results"
+    EMPTY = "empty"
+    LOGIN = "login"
+    CHECKPOINT = "checkpoint"
+    RATE_LIMITED = "rate_limited"
+    UNKNOWN = "unknown"
+
+    @property
+    def blocked(self) -> bool:
+        return self in (PageState.LOGIN, PageState.CHECKPOINT, PageState.RATE_LIMITED)
+
+
+class PageStateClassifier:
+
+    # One round trip gathers every signal the rules need
+    PROBE_SCRIPT = """
+        const body = document.body ? document.body.innerText : '';
+        return {
+            url: window.location.href,
+            items: document.querySelectorAll("a[href*='/marketplace/item/']").length,
+            login_form: !!document.querySelector("input[name='pass'], form[action*='login']"),
+            text: body.slice(0, 3000)
+        };
+    """
+
+    CHECKPOINT_PHRASES = (
+        "confirm your identity",
+        "security check",
+        "your account has been locked",
+        "we suspended your account",
+    )
+    RATE_LIMIT_PHRASES = (
+        "you're temporarily blocked",
+        "you’re temporarily blocked",
+        "going too fast",
+        "try again later",
+        "rate limit",
+    )
+    EMPTY_PHRASES = (
+        "no listings found",
+        "we couldn't find",
+        "we couldn’t find",
+        "no results",
+    )
+
+    def classify(self, driver) -> PageState:
+        try:
+            signals = driver.execute_script(self.PROBE_SCRIPT) or {}
+        except Exception as e:
+            logger.debug(f"[PageState] Probe failed: {e}")
+            signals = {}
+
+        if not signals.get("url"):
+            try:
+                signals["url"] = driver.current_url
+            except Exception:
+                return PageState.UNKNOWN
+
+        state = self.classify_signals(signals)
+        if state.blocked:
+            logger.warning(f"[PageState] Detected {state.value} page")
+        return state
+
+    def classify_signals(self, signals: Dict[str, Any]) -> PageState:
+        url = (signals.get("url") or "").lower()
+        text = (signals.get("text") or "").lower()
+        items: Optional[int] = signals.get("items")
+
+        # Block URLs are unambiguous; block phrases are not, since listing
+        # titles and descriptions can contain them, so results win there
+        if "/checkpoint" in url:
+            return PageState.CHECKPOINT
+        if "/login" in url:
+            return PageState.LOGIN
+        if items:
+            return PageState.RESULTS
+        if self._contains(text, self.CHECKPOINT_PHRASES):
+            return PageState.CHECKPOINT
+        if signals.get("login_form"):
+            return PageState.LOGIN
+        if self._contains(text, self.RATE_LIMIT_PHRASES):
+            return PageState.RATE_LIMITED
+        if "/marketplace/" in url and self._contains(text, self.EMPTY_PHRASES):
+            return PageState.EMPTY
+        return PageState.UNKNOWN
+
+    @staticmethod
+    def _contains(text: str, phrases) -> bool:
+        return any(phrase in text for phrase in phrases)
@@ -0,0 +1,233 @@
+# src/services/artifact_service.py
+"""
+Debug artifact capture (screenshots + page HTML)
+Grabs bytes and dedupes on the scraping thread; compresses and writes in the
+background
+"""
+
+import datetime
+import gzip
+import hashlib
+import io
+import logging
+import os
+import queue
+import random
+import re
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Optional, Set
+
+from PIL import Image
+
+from ..core.config_service import ConfigService
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Artifact:
+    failure_type: str
+    timestamp: str
+    url: Optional[str]
+    png: Optional[bytes]
+    html: Optional[str]
+    digest: str
+
+
+class ArtifactService:
+    """
+    Samples, de-duplicates and compresses failure artifacts on a worker thread
+    """
+
+    def __init__(self, config: ConfigService):
+        self.settings = config.artifacts
+        self.enabled = config.logging.save_screenshots_on_error
+        self.root_dir = config.paths.screenshots_dir
+
+        self._queue: queue.Queue = queue.Queue(maxsize=self.settings.queue_size)
+        self._captured: Dict[str, int] = defaultdict(int)
+        self._seen_hashes: Dict[str, Set[str]] = {}
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def capture(
+        self, driver, failure_type: str, include_html: Optional[bool] = None
+    ) -> Optional[str]:
+        """Queue a screenshot (and HTML) of the current page; returns its name"""
+        if not self.enabled or not driver or not self._should_capture(failure_type):
+            return None
+
+        if include_html is None:
+            include_html = self.settings.capture_html
+
+        try:
+            # HTML first: a page already saved needs no screenshot round trip
+            html = driver.page_source if include_html else None
+            digest = self._fingerprint(html)[:10] if html is not None else None
+            if digest and self._is_duplicate(failure_type, digest):
+                return None
+            png = driver.get_screenshot_as_png()
+            url = driver.current_url
+        except Exception as e:
+            logger.warning("[Artifacts] Capture failed: %s", e)
+            return None
+
+        digest = digest or self._fingerprint(None, png)[:10]
+        # Only distinct pages count against max_per_type
+        if not self._reserve(failure_type, digest):
+            return None
+
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        artifact = Artifact(failure_type, timestamp, url, png, html, digest)
+
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(artifact)
+        except queue.Full:
+            logger.warning("[Artifacts] Queue full, dropped %s", failure_type)
+            self._release(failure_type, digest)
+            return None
+
+        name = f"{failure_type}/{timestamp}"
+        logger.info("[Artifacts] Queued %s", name)
+        return name
+
+    def flush(self, timeout: float = 30) -> None:
+        """Block until every queued artifact has been written"""
+        if not self._worker:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def stop(self, timeout: float = 30) -> None:
+        self.flush(timeout)
+        if self._worker:
+            self._queue.put(None)
+            self._worker.join(timeout)
+            self._worker = None
+
+    def _should_capture(self, failure_type: str) -> bool:
+        with self._lock:
+            if self._captured[failure_type] >= self.settings.max_per_type:
+                return False
+        return random.random() < self.settings.sample_rate
+
+    def _is_duplicate(self, failure_type: str, digest: str) -> bool:
+        with self._lock:
+            duplicate = digest in self._seen(failure_type)
+        if duplicate:
+            logger.info("[Artifacts] Skipped duplicate %s page", failure_type)
+        return duplicate
+
+    def _reserve(self, failure_type: str, digest: str) -> bool:
+        with self._lock:
+            seen = self._seen(failure_type)
+            if digest in seen:
+                logger.info("[Artifacts] Skipped duplicate %s page", failure_type)
+                return False
+            if self._captured[failure_type] >= self.settings.max_per_type:
+                return False
+            seen.add(digest)
+            self._captured[failure_type] += 1
+            return True
+
+    def _release(self, failure_type: str, digest: str) -> None:
+        with self._lock:
+            self._seen(failure_type).discard(digest)
+            self._captured[failure_type] -= 1
+
+    def _ensure_worker(self) -> None:
+        with self._lock:
+            if self._worker and self._worker.is_alive():
+                return
+            self._worker = threading.Thread(
+                target=self._run, name="artifact-writer", daemon=True
+            )
+            self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            if isinstance(item, threading.Event):
+                item.set()
+                continue
+            try:
+                self._write(item)
+            except Exception as e:
+                logger.warning("[Artifacts] Write failed: %s", e)
+
+    def _write(self, artifact: Artifact) -> None:
+        directory = os.path.join(self.root_dir, artifact.failure_type)
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, f"{artifact.timestamp}_{artifact.digest}")
+
+        if artifact.png:
+            image_path = f"{base}.{self.settings.image_format}"
+            with open(image_path, "wb") as f:
+                f.write(self._compress_image(artifact.png))
+
+        if artifact.html is not None:
+            with gzip.open(f"{base}.html.gz", "wt", encoding="utf-8") as f:
+                if artifact.url:
+                    f.write(f"<!-- {artifact.url} -->\n")
+                f.write(artifact.html)
+
+        logger.info("[Artifacts] Saved %s", base)
+        self._apply_retention(directory)
+
+    def _seen(self, failure_type: str) -> Set[str]:
+        """Digests already on disk, so identical pages dedupe across runs too"""
+        if failure_type not in self._seen_hashes:
+            directory = os.path.join(self.root_dir, failure_type)
+            os.makedirs(directory, exist_ok=True)
+            self._seen_hashes[failure_type] = {
+                name.split(".")[0].rsplit("_", 1)[-1] for name in os.listdir(directory)
+            }
+        return self._seen_hashes[failure_type]
+
+    def _compress_image(self, png: bytes) -> bytes:
+        fmt = self.settings.image_format.lower()
+        if fmt == "png":
+            return png
+
+        image = Image.open(io.BytesIO(png))
+        if fmt in ("jpg", "jpeg"):
+            image = image.convert("RGB")
+        out = io.BytesIO()
+        image.save(
+            out,
+            format="JPEG" if fmt == "jpg" else fmt.upper(),
+            quality=self.settings.quality,
+        )
+        return out.getvalue()
+
+    @staticmethod
+    def _fingerprint(html: Optional[str], png: Optional[bytes] = None) -> str:
+        if html is None:
+            return hashlib.sha1(png or b"").hexdigest()
+
+        # Scripts, numbers (timestamps, ids, tokens) and whitespace differ
+        # between otherwise identical checkpoint/login pages
+        text = re.sub(r"<(script|style)\b.*?</\1>", "", html, flags=re.S | re.I)
+        text = re.sub(r"\d+", "0", text)
+        text = re.sub(r"\s+", " ", text)
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+    def _apply_retention(self, directory: str) -> None:
+        files = sorted(
+            (entry for entry in os.scandir(directory) if entry.is_file()),
+            key=lambda entry: entry.stat().st_mtime,
+            reverse=True,
+        )
+        # Each capture is up to two files (image + HTML)
+        for entry in files[self.settings.retention_per_type * 2:]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
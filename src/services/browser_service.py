@@ -6,9 +6,13 @@ Ported from scraper code
 
 import logging
 import os
-import subprocess
-import time
-from typing import Optional
+import subprocess
+import threading
+import time
+import weakref
+from typing import Optional, Set
+
+import psutil
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
@@ -16,22 +20,88 @@ from selenium.webdriver.support.ui import WebDriverWait
 
 
 from ..core.config_service import ConfigService
-from .proxy_service import ProxyService
+from .artifact_service import ArtifactService
+from .proxy_service import ProxyForwarder, ProxyService
 
 
-logger = logging.getLogger(__name__)
+logger = logging.getLogger(__name__)
+
+CHROME_BINARY = "/opt/chrome-linux64/chrome"
+CHROMEDRIVER_BINARY = "/usr/bin/chromedriver"
+
+# Maximum stealth options, shared with the CDP engine
+STEALTH_ARGUMENTS = [
+    "--disable-blink-features=AutomationControlled",
+    "--disable-extensions",
+    "--disable-plugins",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-translate",
+    "--hide-scrollbars",
+    "--mute-audio",
+    "--no-first-run",
+    "--disable-background-timer-throttling",
+    "--disable-backgrounding-occluded-windows",
+    "--disable-renderer-backgrounding",
+    "--disable-features=TranslateUI",
+    "--disable-ipc-flooding-protection",
+]
+
+STEALTH_SCRIPTS = [
+    # Hide webdriver property
+    "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})",
+    # Override plugins
+    "Object.defineProperty(navigator, 'plugins', {get: () => [1, 2, 3, 4, 5]})",
+    # Override languages
+    "Object.defineProperty(navigator, 'languages', {get: () => ['en-US', 'en']})",
+]
 
 
+def kill_process_tree(pid: int, timeout: float = 5) -> int:
+    """Kill a process and all its descendants, returning how many died"""
+    try:
+        root = psutil.Process(pid)
+        procs = root.children(recursive=True) + [root]
+    except psutil.NoSuchProcess:
+        return 0
+
+    for proc in procs:
+        try:
+            proc.kill()
+        except psutil.NoSuchProcess:
+            pass
+
+    gone, alive = psutil.wait_procs(procs, timeout=timeout)
+    for proc in alive:
+        logger.warning("[Browser] Process %s survived kill", proc.pid)
+    return len(gone)
+
+
 class BrowserService:
     """
     Manages Chrome instances with stealth and proxy support
     """
     
-    def __init__(self, config: ConfigService, proxy_service: ProxyService = None):
+    # Held while launching Chrome and while reaping orphans, so a driver
+    # that is still starting up is never mistaken for an orphan
+    launch_lock = threading.RLock()
+    _instances: "weakref.WeakSet[BrowserService]" = weakref.WeakSet()
+    # Chrome launched without a driver above it (the CDP engine)
+    _external_pids: Set[int] = set()
+    
+    def __init__(
+        self,
+        config: ConfigService,
+        proxy_service: ProxyService = None,
+        artifacts: ArtifactService = None,
+    ):
         self.config = config
         self.proxy_service = proxy_service
+        self.artifacts = artifacts
         self.driver: Optional[webdriver.Chrome] = None
+        self._forwarder: Optional[ProxyForwarder] = None
         self._proxy_env_backup = {}
+        BrowserService._instances.add(self)
         self._ensure_environment()
     
     def _ensure_environment(self):
@@ -59,7 +129,7 @@ class BrowserService:
         try:
             # Test Chrome
             result = subprocess.run([
-                "/opt/chrome-linux64/chrome", "--version"
+                CHROME_BINARY, "--version"
             ], capture_output=True, text=True, timeout=10)
             
             if result.returncode == 0:
@@ -69,7 +139,7 @@ class BrowserService:
             
             # Test ChromeDriver
             result = subprocess.run([
-                "/usr/bin/chromedriver", "--version"
+                CHROMEDRIVER_BINARY, "--version"
             ], capture_output=True, text=True, timeout=10)
             
             if result.returncode == 0:
@@ -80,8 +150,12 @@ class BrowserService:
         except Exception as e:
             raise RuntimeError(f"Binary test failed: {e}")
     
-    def create_driver(self) -> webdriver.Chrome:
-        """Create Chrome driver with stealth and proxy"""
+    def create_driver(self) -> webdriver.Chrome:
+        """Create Chrome driver with stealth and proxy"""
+        with BrowserService.launch_lock:
+            return self._create_driver()
+    
+    def _create_driver(self) -> webdriver.Chrome:
         logger.info("[Browser] Creating stealth Chrome driver...")
         
         # Clear proxy env vars that interfere with Chrome startup
@@ -93,9 +167,11 @@ class BrowserService:
             
             self.driver = webdriver.Chrome(service=service, options=options)
             
-            # Configure timeouts
-            self.driver.implicitly_wait(10)
-            self.driver.set_page_load_timeout(30)
+            # Configure timeouts from the performance profile
+            profile = self.config.performance
+            self.driver.implicitly_wait(profile.implicit_wait)
+            self.driver.set_page_load_timeout(profile.page_load_timeout)
+            self.driver.set_script_timeout(profile.script_timeout)
             
             # Apply stealth patches
             self._apply_stealth_patches()
@@ -120,69 +196,53 @@ class BrowserService:
     def _get_stealth_options(self) -> Options:
         """Get Chrome options with maximum stealth"""
         options = Options()
+        options.page_load_strategy = self.config.performance.page_load_strategy
         
         # Essential Docker options
-        options.add_argument("--headless=new")
+        if self.config.browser.headless:
+            options.add_argument("--headless=new")
         options.add_argument("--no-sandbox")
         options.add_argument("--disable-dev-shm-usage")
         options.add_argument("--disable-gpu")
         
         # Window and display
-        options.add_argument("--window-size=1920,1080")
+        options.add_argument(f"--window-size={self.config.browser.window_size}")
         options.add_argument("--start-maximized")
         
         # Maximum stealth options
-        options.add_argument("--disable-blink-features=AutomationControlled")
-        options.add_argument("--disable-extensions")
-        options.add_argument("--disable-plugins")
-        options.add_argument("--disable-default-apps")
-        options.add_argument("--disable-sync")
-        options.add_argument("--disable-translate")
-        options.add_argument("--hide-scrollbars")
-        options.add_argument("--mute-audio")
-        options.add_argument("--no-first-run")
-        options.add_argument("--disable-background-timer-throttling")
-        options.add_argument("--disable-backgrounding-occluded-windows")
-        options.add_argument("--disable-renderer-backgrounding")
-        options.add_argument("--disable-features=TranslateUI")
-        options.add_argument("--disable-ipc-flooding-protection")
+        for argument in STEALTH_ARGUMENTS:
+            options.add_argument(argument)
+        
+        # User agent (should match the bundled Chrome version)
+        options.add_argument(f"--user-agent={self.config.browser.user_agent}")
         
-        # User agent (matching scraper exactly)
-        options.add_argument("--user-agent=Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/137.0.7151.103 Safari/537.36")
+        # Route all browser traffic through this service's proxy exit
+        if self.proxy_service and self.proxy_service.is_configured():
+            if not self._forwarder:
+                self._forwarder = ProxyForwarder(self.proxy_service.get_proxy_url())
+            options.add_argument(f"--proxy-server=http://{self._forwarder.start()}")
         
         # Experimental options for stealth
         options.add_experimental_option("excludeSwitches", ["enable-automation"])
         options.add_experimental_option('useAutomationExtension', False)
         
         # Chrome binary
-        options.binary_location = "/opt/chrome-linux64/chrome"
+        options.binary_location = CHROME_BINARY
         
         return options
     
     def _get_chrome_service(self) -> Service:
         """Get Chrome service"""
         return Service(
-            executable_path="/usr/bin/chromedriver",
+            executable_path=CHROMEDRIVER_BINARY,
             log_output=subprocess.DEVNULL
         )
     
     def _apply_stealth_patches(self):
         """Apply JavaScript stealth patches"""
         try:
-            # Hide webdriver property
-            self.driver.execute_script(
-                "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
-            )
-            
-            # Override plugins
-            self.driver.execute_script(
-                "Object.defineProperty(navigator, 'plugins', {get: () => [1, 2, 3, 4, 5]})"
-            )
-            
-            # Override languages
-            self.driver.execute_script(
-                "Object.defineProperty(navigator, 'languages', {get: () => ['en-US', 'en']})"
-            )
+            for script in STEALTH_SCRIPTS:
+                self.driver.execute_script(script)
             
             logger.info("[Browser] ✅ Stealth patches applied")
             
@@ -215,14 +275,19 @@ class BrowserService:
         return self.driver
     
     def take_screenshot(self, name: str = "screenshot") -> Optional[str]:
-        """Take screenshot"""
+        """Take screenshot, in the background when an ArtifactService is set"""
         if not self.driver:
             return None
         
+        if self.artifacts:
+            return self.artifacts.capture(self.driver, name)
+        
         try:
             import datetime
             timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"/app/logs/{name}_{timestamp}.png"  # Changed from /tmp
+            filename = os.path.join(
+                self.config.paths.screenshots_dir, f"{name}_{timestamp}.png"
+            )
             self.driver.save_screenshot(filename)
             logger.info("[Browser] Screenshot: %s", filename)
             return filename
@@ -230,18 +295,60 @@ class BrowserService:
             logger.warning("[Browser] Screenshot failed: %s", e)
             return None
     
+    def driver_pid(self) -> Optional[int]:
+        """PID of the chromedriver process (Chrome runs beneath it)"""
+        try:
+            return self.driver.service.process.pid if self.driver else None
+        except AttributeError:
+            return None
+    
+    @classmethod
+    def register_pid(cls, pid: int) -> None:
+        """Count a Chrome launched outside BrowserService as live"""
+        cls._external_pids.add(pid)
+    
+    @classmethod
+    def unregister_pid(cls, pid: int) -> None:
+        cls._external_pids.discard(pid)
+    
+    @classmethod
+    def live_pids(cls) -> Set[int]:
+        """PIDs of every driver or CDP Chrome tree launched by this process"""
+        roots = {service.driver_pid() for service in list(cls._instances)}
+        roots.update(cls._external_pids)
+        pids = set()
+        for pid in roots:
+            if not pid:
+                continue
+            try:
+                root = psutil.Process(pid)
+                pids.add(pid)
+                pids.update(child.pid for child in root.children(recursive=True))
+            except psutil.NoSuchProcess:
+                continue
+        return pids
+    
     def quit(self):
-        """Quit browser safely"""
+        """Quit browser safely, force-killing the process tree on failure"""
         if self.driver:
-            try:
-                self.driver.quit()
-                self.driver = None
-                logger.info("[Browser] ✅ Browser closed")
-            except Exception as e:
-                logger.warning("[Browser] Error closing: %s", e)
-    
-    def wait(self, timeout: int = 10):
-        """Get WebDriverWait instance"""
+            pid = self.driver_pid()
+            try:
+                self.driver.quit()
+                logger.info("[Browser] ✅ Browser closed")
+            except Exception as e:
+                logger.warning("[Browser] Error closing: %s", e)
+                if pid:
+                    kill_process_tree(pid)
+            finally:
+                self.driver = None
+        if self._forwarder:
+            self._forwarder.stop()
+            self._forwarder = None
+    
+    def wait(self, timeout: Optional[float] = None):
+        """Get WebDriverWait instance, defaulting to the profile's element wait"""
+        if timeout is None:
+            timeout = self.config.performance.element_wait
         return WebDriverWait(self.get_driver(), timeout)
     
     def __enter__(self):
@@ -0,0 +1,409 @@
+# src/services/cdp_browser_service.py
+"""
+Asyncio Chrome DevTools Protocol client
+One WebSocket per browser multiplexes every tab via flattened sessions
+"""
+
+import asyncio
+import base64
+import itertools
+import json
+import logging
+import re
+import shutil
+import tempfile
+from typing import Any, Callable, Coroutine, Dict, List, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+import websockets
+
+from ..core.config_service import ConfigService
+from .browser_service import (
+    CHROME_BINARY,
+    STEALTH_ARGUMENTS,
+    STEALTH_SCRIPTS,
+    BrowserService,
+)
+
+
+logger = logging.getLogger(__name__)
+
+# Event each WebDriver pageLoadStrategy waits for
+LOAD_EVENTS = {
+    "normal": "Page.loadEventFired",
+    "eager": "Page.domContentEventFired",
+    "none": None,
+}
+
+
+def _spawn(tasks: Set[asyncio.Task], coro: Coroutine, label: str) -> asyncio.Task:
+    """
+    Start a background task and hold a reference to it until it is done;
+    the event loop only keeps weak ones, so an untracked task can be
+    collected mid-flight (leaving e.g. a paused request paused forever)
+    """
+    task = asyncio.create_task(coro)
+    tasks.add(task)
+
+    def done(task: asyncio.Task) -> None:
+        tasks.discard(task)
+        if not task.cancelled() and task.exception():
+            logger.warning("[CDP] %s failed: %s", label, task.exception())
+
+    task.add_done_callback(done)
+    return task
+
+
+class CdpError(RuntimeError):
+    pass
+
+
+class CdpConnection:
+    """Request/response and event routing over a DevTools WebSocket"""
+
+    def __init__(self, ws_url: str):
+        self.ws_url = ws_url
+        self._ws = None
+        self._reader: Optional[asyncio.Task] = None
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._handlers: Dict[Tuple[Optional[str], str], List[Callable]] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def connect(self) -> None:
+        self._ws = await websockets.connect(self.ws_url, max_size=None)
+        self._reader = asyncio.create_task(self._read_loop())
+
+    async def send(
+        self,
+        method: str,
+        params: Optional[Dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+        timeout: float = 30,
+    ) -> Dict[str, Any]:
+        message_id = next(self._ids)
+        message = {"id": message_id, "method": method, "params": params or {}}
+        if session_id:
+            message["sessionId"] = session_id
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[message_id] = future
+        try:
+            await self._ws.send(json.dumps(message))
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self._pending.pop(message_id, None)
+
+    def on(self, method: str, handler: Callable, session_id: Optional[str] = None):
+        self._handlers.setdefault((session_id, method), []).append(handler)
+
+    def off(self, method: str, handler: Callable, session_id: Optional[str] = None):
+        handlers = self._handlers.get((session_id, method), [])
+        if handler in handlers:
+            handlers.remove(handler)
+
+    def wait_for(
+        self, method: str, session_id: Optional[str] = None
+    ) -> asyncio.Future:
+        """Future for the next occurrence of an event; cancel it to stop waiting"""
+        future = asyncio.get_running_loop().create_future()
+
+        def handler(params):
+            if not future.done():
+                future.set_result(params)
+
+        self.on(method, handler, session_id)
+        future.add_done_callback(lambda _: self.off(method, handler, session_id))
+        return future
+
+    async def close(self) -> None:
+        if self._ws:
+            await self._ws.close()
+        if self._reader:
+            await asyncio.gather(self._reader, return_exceptions=True)
+
+    async def _read_loop(self) -> None:
+        try:
+            async for raw in self._ws:
+                message = json.loads(raw)
+
+                if "id" in message:
+                    future = self._pending.get(message["id"])
+                    if not future or future.done():
+                        continue
+                    if "error" in message:
+                        future.set_exception(CdpError(message["error"].get("message")))
+                    else:
+                        future.set_result(message.get("result", {}))
+                    continue
+
+                key = (message.get("sessionId"), message.get("method"))
+                for handler in list(self._handlers.get(key, ())):
+                    try:
+                        result = handler(message.get("params", {}))
+                        if asyncio.iscoroutine(result):
+                            _spawn(self._tasks, result, f"Handler for {key[1]}")
+                    except Exception as e:
+                        logger.warning("[CDP] Handler for %s failed: %s", key[1], e)
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("DevTools connection closed"))
+
+
+class CdpPage:
+    """A single tab, addressed by its flattened session id"""
+
+    def __init__(self, connection: CdpConnection, target_id: str, session_id: str):
+        self.connection = connection
+        self.target_id = target_id
+        self.session_id = session_id
+
+    async def send(self, method: str, params: Optional[Dict[str, Any]] = None, **kw):
+        return await self.connection.send(method, params, self.session_id, **kw)
+
+    async def enable(self, proxy_auth: Optional[Tuple[str, str]] = None) -> None:
+        await self.send("Page.enable")
+        for script in STEALTH_SCRIPTS:
+            await self.send("Page.addScriptToEvaluateOnNewDocument", {"source": script})
+
+        if proxy_auth:
+            await self._enable_proxy_auth(*proxy_auth)
+
+    async def navigate(
+        self, url: str, timeout: float = 30, strategy: str = "normal"
+    ) -> None:
+        event = LOAD_EVENTS[strategy]
+        loaded = self.connection.wait_for(event, self.session_id) if event else None
+        try:
+            result = await self.send("Page.navigate", {"url": url})
+            if result.get("errorText"):
+                raise CdpError(f"Navigation failed: {result['errorText']}")
+            if loaded is None:
+                return
+
+            try:
+                await asyncio.wait_for(loaded, timeout)
+            except asyncio.TimeoutError:
+                # Same as an eager load strategy: the DOM is usually usable
+                logger.warning("[CDP] Load event timed out after %ss: %s", timeout, url)
+        finally:
+            # Unregisters the load handler if navigation failed
+            if loaded is not None:
+                loaded.cancel()
+
+    async def evaluate(self, expression: str, timeout: float = 30) -> Any:
+        result = await self.send(
+            "Runtime.evaluate",
+            {"expression": expression, "returnByValue": True, "awaitPromise": True},
+            timeout=timeout,
+        )
+        if "exceptionDetails" in result:
+            details = result["exceptionDetails"]
+            exception = details.get("exception", {})
+            raise CdpError(exception.get("description") or details.get("text"))
+        return result.get("result", {}).get("value")
+
+    async def execute_script(self, body: str, *args: Any) -> Any:
+        """Run a Selenium-style function body with JSON-serialisable arguments"""
+        return await self.evaluate(
+            f"(function() {{{body}}}).apply(null, {json.dumps(list(args))})"
+        )
+
+    async def current_url(self) -> str:
+        return await self.evaluate("window.location.href")
+
+    async def set_cookies(self, cookies: List[Dict[str, Any]]) -> None:
+        """Install cookies saved in Selenium's format"""
+        converted = []
+        for cookie in cookies:
+            entry = {
+                key: cookie[key]
+                for key in ("name", "value", "domain", "path", "secure", "httpOnly")
+                if key in cookie
+            }
+            if "expiry" in cookie:
+                entry["expires"] = cookie["expiry"]
+            if cookie.get("sameSite") in ("Strict", "Lax", "None"):
+                entry["sameSite"] = cookie["sameSite"]
+            converted.append(entry)
+        await self.send("Network.setCookies", {"cookies": converted})
+
+    async def screenshot(self) -> bytes:
+        result = await self.send("Page.captureScreenshot", {"format": "png"})
+        return base64.b64decode(result["data"])
+
+    async def close(self) -> None:
+        try:
+            await self.connection.send(
+                "Target.closeTarget", {"targetId": self.target_id}
+            )
+        except Exception as e:
+            logger.debug("[CDP] Close target failed: %s", e)
+
+    async def _enable_proxy_auth(self, username: str, password: str) -> None:
+        async def on_auth(params):
+            await self.send(
+                "Fetch.continueWithAuth",
+                {
+                    "requestId": params["requestId"],
+                    "authChallengeResponse": {
+                        "response": "ProvideCredentials",
+                        "username": username,
+                        "password": password,
+                    },
+                },
+            )
+
+        async def on_paused(params):
+            await self.send("Fetch.continueRequest", {"requestId": params["requestId"]})
+
+        self.connection.on("Fetch.authRequired", on_auth, self.session_id)
+        self.connection.on("Fetch.requestPaused", on_paused, self.session_id)
+        await self.send("Fetch.enable", {"handleAuthRequests": True})
+
+
+class CdpBrowser:
+    """
+    Launches (or attaches to) Chrome and hands out CDP pages
+    """
+
+    def __init__(
+        self,
+        chrome_binary: str = CHROME_BINARY,
+        arguments: Optional[List[str]] = None,
+        proxy_url: Optional[str] = None,
+        user_agent: Optional[str] = None,
+        headless: bool = True,
+        window_size: str = "1920,1080",
+    ):
+        self.chrome_binary = chrome_binary
+        self.arguments = arguments if arguments is not None else list(STEALTH_ARGUMENTS)
+        self.proxy_url = proxy_url
+        self.user_agent = user_agent
+        self.headless = headless
+        self.window_size = window_size
+        self.connection: Optional[CdpConnection] = None
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self._user_data_dir: Optional[str] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    @classmethod
+    def from_config(
+        cls, config: ConfigService, proxy_url: Optional[str] = None
+    ) -> "CdpBrowser":
+        """Browser with the same headless mode, window and UA as BrowserService"""
+        return cls(
+            proxy_url=proxy_url,
+            user_agent=config.browser.user_agent,
+            headless=config.browser.headless,
+            window_size=config.browser.window_size,
+        )
+
+    async def launch(self, timeout: float = 30) -> "CdpBrowser":
+        logger.info("[CDP] Launching Chrome...")
+        self._user_data_dir = tempfile.mkdtemp(prefix="aetos-cdp-")
+
+        args = [
+            "--remote-debugging-port=0",
+            f"--user-data-dir={self._user_data_dir}",
+            "--no-sandbox",
+            "--disable-dev-shm-usage",
+            "--disable-gpu",
+            f"--window-size={self.window_size}",
+            *self.arguments,
+        ]
+        if self.headless:
+            args.append("--headless=new")
+        if self.user_agent:
+            args.append(f"--user-agent={self.user_agent}")
+        if self.proxy_url:
+            proxy = urlparse(self.proxy_url)
+            args.append(f"--proxy-server={proxy.scheme}://{proxy.hostname}:{proxy.port}")
+        args.append("about:blank")
+
+        # Registered under the launch lock so the watchdog's reaper never
+        # sees this Chrome before it is counted as live
+        with BrowserService.launch_lock:
+            self.process = await asyncio.create_subprocess_exec(
+                self.chrome_binary,
+                *args,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            BrowserService.register_pid(self.process.pid)
+
+        ws_url = await asyncio.wait_for(self._read_ws_url(), timeout)
+        await self.connect(ws_url)
+        logger.info("[CDP] ✅ Chrome ready")
+        return self
+
+    async def connect(self, ws_url: str) -> "CdpBrowser":
+        self.connection = CdpConnection(ws_url)
+        await self.connection.connect()
+        return self
+
+    async def new_page(self) -> CdpPage:
+        target = await self.connection.send(
+            "Target.createTarget", {"url": "about:blank"}
+        )
+        attached = await self.connection.send(
+            "Target.attachToTarget", {"targetId": target["targetId"], "flatten": True}
+        )
+        page = CdpPage(self.connection, target["targetId"], attached["sessionId"])
+        await page.enable(self._proxy_auth())
+        return page
+
+    async def close(self) -> None:
+        if self.connection:
+            try:
+                await self.connection.send("Browser.close", timeout=5)
+            except Exception:
+                pass
+            await self.connection.close()
+            self.connection = None
+
+        if self.process:
+            if self.process.returncode is None:
+                self.process.kill()
+                await self.process.wait()
+            BrowserService.unregister_pid(self.process.pid)
+        self.process = None
+
+        if self._user_data_dir:
+            shutil.rmtree(self._user_data_dir, ignore_errors=True)
+            self._user_data_dir = None
+        logger.info("[CDP] ✅ Browser closed")
+
+    async def _read_ws_url(self) -> str:
+        while True:
+            line = await self.process.stderr.readline()
+            if not line:
+                raise CdpError("Chrome exited before DevTools was ready")
+            match = re.search(rb"DevTools listening on (ws://\S+)", line)
+            if match:
+                # Keep draining stderr so Chrome never blocks on a full pipe
+                _spawn(self._tasks, self._drain_stderr(), "Draining Chrome stderr")
+                return match.group(1).decode()
+
+    async def _drain_stderr(self) -> None:
+        while self.process and await self.process.stderr.readline():
+            pass
+
+    def _proxy_auth(self) -> Optional[Tuple[str, str]]:
+        if not self.proxy_url:
+            return None
+        proxy = urlparse(self.proxy_url)
+        if proxy.username and proxy.password:
+            return proxy.username, proxy.password
+        return None
+
+    async def __aenter__(self) -> "CdpBrowser":
+        if not self.connection:
+            await self.launch()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
@@ -0,0 +1,115 @@
+# src/services/circuit_breaker.py
+"""
+Circuit breakers for accounts and proxies that keep getting blocked
+"""
+
+import logging
+import random
+import time
+from enum import Enum
+from typing import Callable, Dict, Iterable, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Opens after repeated failures and stays open for an exponentially
+    growing backoff; one trial request is let through once it expires
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 3,
+        base_backoff: float = 60,
+        max_backoff: float = 3600,
+        jitter: float = 0.1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.clock = clock
+
+        self.failures = 0
+        self.trips = 0
+        self.last_reason: Optional[str] = None
+        self._open_until = 0.0
+
+    @property
+    def state(self) -> CircuitState:
+        if self.trips == 0 or self.failures < self.failure_threshold:
+            return CircuitState.CLOSED
+        if self.clock() < self._open_until:
+            return CircuitState.OPEN
+        return CircuitState.HALF_OPEN
+
+    @property
+    def retry_in(self) -> float:
+        return max(0.0, self._open_until - self.clock())
+
+    def allow(self) -> bool:
+        return self.state != CircuitState.OPEN
+
+    def record_success(self) -> None:
+        if self.trips:
+            logger.info("[Breaker] %s recovered after %s trip(s)", self.name, self.trips)
+        self.failures = 0
+        self.trips = 0
+        self.last_reason = None
+        self._open_until = 0.0
+
+    def record_failure(self, reason: str = "", severe: bool = False) -> None:
+        """Count a failure; severe failures (checkpoints, bans) trip at once"""
+        self.last_reason = reason
+        self.failures = self.failure_threshold if severe else self.failures + 1
+
+        if self.failures < self.failure_threshold:
+            return
+
+        # A failed half-open trial re-trips with a longer backoff
+        self.trips += 1
+        backoff = min(self.base_backoff * 2 ** (self.trips - 1), self.max_backoff)
+        backoff *= 1 + random.uniform(-self.jitter, self.jitter)
+        self._open_until = self.clock() + backoff
+
+        logger.warning(
+            "[Breaker] %s open for %.0fs (trip %s): %s",
+            self.name,
+            backoff,
+            self.trips,
+            reason or "failures",
+        )
+
+
+class CircuitBreakerRegistry:
+    """Breakers keyed by worker resource, e.g. 'account:main' or 'proxy:leeds'"""
+
+    def __init__(self, **breaker_kwargs):
+        self.breaker_kwargs = breaker_kwargs
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, name: str) -> CircuitBreaker:
+        if name not in self._breakers:
+            self._breakers[name] = CircuitBreaker(name, **self.breaker_kwargs)
+        return self._breakers[name]
+
+    def is_available(self, name: str) -> bool:
+        return self.get(name).allow()
+
+    def pick(self, names: Iterable[str]) -> Optional[str]:
+        """Return the healthiest available resource, or None if all are open"""
+        available = [name for name in names if self.is_available(name)]
+        if not available:
+            return None
+        return min(available, key=lambda name: self.get(name).failures)
@@ -0,0 +1,252 @@
+# src/services/driver_watchdog.py
+"""
+Watchdog for the chromedriver/Chrome process tree
+Enforces per-operation deadlines, resource limits and orphan cleanup
+"""
+
+import concurrent.futures
+import contextvars
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional, Set
+
+import psutil
+
+from ..core.config_service import ConfigService
+from .browser_service import BrowserService, kill_process_tree
+
+
+logger = logging.getLogger(__name__)
+
+# Matched as name prefixes, so "chrome" also covers chrome_crashpad_handler
+BROWSER_PROCESS_NAMES = ("chrome", "chromedriver")
+
+
+class OperationTimeout(RuntimeError):
+    pass
+
+
+class RestartFailed(RuntimeError):
+    """The driver was replaced but the restart hook could not recover"""
+
+
+class DriverWatchdog:
+    """
+    Supervises the driver owned by a BrowserService
+
+    Operations wrapped in run() get a wall-clock deadline; a background
+    thread samples RSS/CPU of the driver's process tree and reaps orphans.
+    Restarts only ever happen on the calling thread, inside run(), and
+    on_restart must re-attach callers to the new driver (returning False
+    or raising aborts the operation with RestartFailed). The hook should
+    drive the browser through run() too; an overrun there kills the driver
+    and fails the restart rather than restarting again.
+    """
+
+    def __init__(
+        self,
+        config: ConfigService,
+        browser: BrowserService,
+        on_restart: Optional[Callable[[], Any]] = None,
+    ):
+        self.config = config.watchdog
+        self.deadlines = config.performance.operation_deadlines
+        self.browser = browser
+        self.on_restart = on_restart
+        self.restarts = 0
+
+        self._executor = self._new_executor()
+        self._restart_reason: Optional[str] = None
+        self._restarting = False
+        self._cpu_strikes = 0
+        self._procs: Dict[int, psutil.Process] = {}
+        self._stop = threading.Event()
+        self._monitor: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if not self.config.enabled or self._monitor:
+            return
+        self._stop.clear()
+        self._monitor = threading.Thread(
+            target=self._monitor_loop, name="driver-watchdog", daemon=True
+        )
+        self._monitor.start()
+        logger.info("[Watchdog] Started")
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._monitor:
+            self._monitor.join(timeout=self.config.check_interval)
+            self._monitor = None
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def run(self, name: str, fn: Callable, *args, deadline: float = None, **kwargs):
+        """Run a driver operation, restarting the driver if it overruns"""
+        if self._restart_reason and not self._restarting:
+            self.restart(self._restart_reason)
+
+        deadline = deadline or self.deadlines.get(name) or self.config.operation_deadline
+        # Carry the caller's log context onto the worker thread
+        context = contextvars.copy_context()
+        future = self._executor.submit(context.run, fn, *args, **kwargs)
+        try:
+            return future.result(timeout=deadline)
+        except concurrent.futures.TimeoutError:
+            logger.error("[Watchdog] ❌ %s exceeded %ss deadline", name, deadline)
+            # The hung worker thread unblocks once its chromedriver dies;
+            # it is abandoned along with the old executor
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = self._new_executor()
+            if self._restarting:
+                # Inside on_restart: restarting again could recurse forever
+                self.kill_driver()
+            else:
+                self.restart(f"{name} timed out")
+            raise OperationTimeout(f"{name} exceeded {deadline}s")
+
+    def restart(self, reason: str) -> None:
+        logger.warning("[Watchdog] 🔄 Restarting driver: %s", reason)
+        self._restart_reason = None
+        self._cpu_strikes = 0
+
+        with BrowserService.launch_lock:
+            self.kill_driver()
+            self.browser.create_driver()
+        self.restarts += 1
+
+        # The hook must re-point callers (scrapers) at the new driver and
+        # restore page state; carrying on with a stale driver would make
+        # every later operation silently come back empty
+        if self.on_restart:
+            self._restarting = True
+            try:
+                recovered = self.on_restart()
+            except Exception as e:
+                raise RestartFailed(f"restart hook failed: {e}") from e
+            finally:
+                self._restarting = False
+            if recovered is False:
+                raise RestartFailed("restart hook could not recover")
+
+    def kill_driver(self) -> None:
+        pid = self.browser.driver_pid()
+        self.browser.driver = None
+        self._procs.clear()
+        if pid:
+            killed = kill_process_tree(pid)
+            logger.info("[Watchdog] Killed %s driver processes", killed)
+
+    def driver_processes(self) -> List[psutil.Process]:
+        pid = self.browser.driver_pid()
+        if not pid:
+            return []
+        try:
+            root = psutil.Process(pid)
+            return [root] + root.children(recursive=True)
+        except psutil.NoSuchProcess:
+            return []
+
+    def check_resources(self) -> Optional[str]:
+        """Sample the driver tree; return a restart reason if over limits"""
+        procs = self.driver_processes()
+        if not procs:
+            return None
+
+        rss = 0
+        cpu = 0.0
+        live = {}
+        for proc in procs:
+            # Reuse Process objects so cpu_percent measures since last sample
+            proc = self._procs.get(proc.pid, proc)
+            live[proc.pid] = proc
+            try:
+                with proc.oneshot():
+                    rss += proc.memory_info().rss
+                    cpu += proc.cpu_percent(interval=None)
+            except psutil.NoSuchProcess:
+                continue
+        self._procs = live
+
+        rss_mb = rss / (1024 * 1024)
+        if rss_mb > self.config.max_rss_mb:
+            return f"RSS {rss_mb:.0f}MB > {self.config.max_rss_mb}MB"
+
+        # Chrome pegs a core briefly on heavy pages, so require a streak
+        over_cpu = cpu > self.config.max_cpu_percent
+        self._cpu_strikes = self._cpu_strikes + 1 if over_cpu else 0
+        if self._cpu_strikes >= self.config.cpu_strikes:
+            return f"CPU {cpu:.0f}% for {self._cpu_strikes} checks"
+        return None
+
+    def reap_orphans(self) -> int:
+        """Kill browser processes outside the live driver tree and reap zombies"""
+        # Every driver and CDP Chrome this process launched, with or without
+        # a watchdog (geo shards have none); no launch can be half-way through
+        with BrowserService.launch_lock:
+            return self._reap_orphans(BrowserService.live_pids())
+
+    def _reap_orphans(self, tracked: Set[int]) -> int:
+        own_pid = os.getpid()
+        reaped = 0
+        xvfb = []
+
+        attrs = ["pid", "name", "ppid", "status", "create_time"]
+        for proc in psutil.process_iter(attrs):
+            info = proc.info
+            if info["pid"] in tracked or info["status"] == psutil.STATUS_ZOMBIE:
+                continue
+            name = (info["name"] or "").lower()
+            if name == "xvfb":
+                xvfb.append(proc)
+                continue
+            if not name.startswith(BROWSER_PROCESS_NAMES):
+                continue
+            # Only orphans: their launcher is gone and they were re-parented.
+            # When we run as PID 1 (plain docker run) orphans land on us, so
+            # our own children only count as ours when we are not init.
+            if info["ppid"] == own_pid and own_pid != 1:
+                continue
+            if info["ppid"] not in (0, 1) and psutil.pid_exists(info["ppid"]):
+                continue
+            reaped += kill_process_tree(info["pid"])
+
+        # The oldest Xvfb is the display every later run reuses; any extra
+        # ones were started by racing runs and serve nobody
+        for proc in sorted(xvfb, key=lambda p: p.info["create_time"])[1:]:
+            reaped += kill_process_tree(proc.pid)
+
+        # Collect exit statuses of our own dead browser children (live ones
+        # are left to their launcher, e.g. asyncio for CDP Chrome)
+        for child in psutil.Process().children():
+            try:
+                if (
+                    child.pid not in tracked
+                    and child.status() == psutil.STATUS_ZOMBIE
+                    and child.name().lower().startswith(BROWSER_PROCESS_NAMES)
+                ):
+                    os.waitpid(child.pid, os.WNOHANG)
+                    reaped += 1
+            except (psutil.NoSuchProcess, ChildProcessError):
+                continue
+
+        if reaped:
+            logger.info("[Watchdog] Reaped %s orphaned/zombie processes", reaped)
+        return reaped
+
+    def _monitor_loop(self) -> None:
+        while not self._stop.wait(self.config.check_interval):
+            try:
+                reason = self.check_resources()
+                if reason and not self._restart_reason:
+                    logger.warning("[Watchdog] ⚠️ Driver over limits: %s", reason)
+                    self._restart_reason = reason
+                self.reap_orphans()
+            except Exception as e:
+                logger.warning("[Watchdog] Check failed: %s", e)
+
+    @staticmethod
+    def _new_executor() -> concurrent.futures.ThreadPoolExecutor:
+        return concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="driver-op"
+        )
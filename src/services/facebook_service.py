@@ -50,7 +50,7 @@ class FacebookService:
                 )
 
         self.driver.refresh()
-        self._human_delay(2, 3)
+        self._human_delay(*self.config.performance.restore_delay)
 
         if self._is_logged_in():
             logger.info("[Facebook] Session restored successfully")
@@ -68,7 +68,7 @@ class FacebookService:
         selectors = ["[aria-label='Home']", "[role='navigation']"]
         for selector in selectors:
             try:
-                WebDriverWait(self.driver, 5).until(
+                WebDriverWait(self.driver, self.config.performance.element_wait).until(
                     lambda d: d.find_element(By.CSS_SELECTOR, selector)
                 )
                 return True
@@ -0,0 +1,277 @@
+# src/services/image_cache_service.py
+"""
+Content-addressed listing image cache
+Downloads outside the browser, dedupes by SHA-256, thumbnails in a
+process pool and evicts least-recently-used blobs past a size budget
+"""
+
+import concurrent.futures
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import requests
+from PIL import Image
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from ..core.config_service import ConfigService
+from ..scraper.listing import Listing
+
+
+logger = logging.getLogger(__name__)
+
+
+def make_thumbnail(blob_path: str, thumb_path: str, size: int) -> Optional[int]:
+    """Write a JPEG thumbnail and return the image's 64-bit dHash"""
+    with Image.open(blob_path) as image:
+        gray = image.convert("L").resize((9, 8), Image.LANCZOS)
+        pixels = list(gray.getdata())
+        dhash = 0
+        for row in range(8):
+            for col in range(8):
+                left = pixels[row * 9 + col]
+                right = pixels[row * 9 + col + 1]
+                dhash = (dhash << 1) | (left > right)
+
+        image = image.convert("RGB")
+        image.thumbnail((size, size))
+        tmp_path = f"{thumb_path}.tmp"
+        image.save(tmp_path, format="JPEG", quality=80)
+        os.replace(tmp_path, thumb_path)
+    return dhash
+
+
+class ImageCacheService:
+
+    def __init__(self, config: ConfigService, session: requests.Session = None):
+        self.settings = config.images
+        self.root_dir = config.paths.images_dir
+        self.index_path = os.path.join(self.root_dir, "index.json")
+        self.session = session or self._build_session()
+
+        self._lock = threading.Lock()
+        # listing key -> sha, image URL -> sha, sha -> blob metadata
+        self._keys: Dict[str, str] = {}
+        self._urls: Dict[str, str] = {}
+        self._blobs: Dict[str, Dict] = {}
+        self._thumbnail_pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
+        self._load_index()
+
+    def _build_session(self) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.settings.max_workers,
+            pool_maxsize=self.settings.max_workers,
+            max_retries=Retry(total=2, backoff_factor=0.5, status_forcelist=[502, 503, 504]),
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def fetch_many(self, listings: Iterable[Listing]) -> Dict[str, str]:
+        """Ensure every listing's image is cached; returns listing key -> sha"""
+        results: Dict[str, str] = {}
+        pending: List[Listing] = []
+
+        for listing in listings:
+            sha = self._lookup(listing)
+            if sha:
+                listing.image_sha = sha
+                results[listing.key] = sha
+            elif listing.image_url:
+                pending.append(listing)
+
+        if not pending:
+            return results
+
+        new_blobs = []
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.settings.max_workers, thread_name_prefix="image-fetch"
+        ) as pool:
+            futures = {pool.submit(self._download, l.image_url): l for l in pending}
+            for future in concurrent.futures.as_completed(futures):
+                listing = futures[future]
+                try:
+                    sha, is_new = future.result()
+                except Exception as e:
+                    logger.warning("[Images] Fetch failed for %s: %s", listing.key, e)
+                    continue
+                with self._lock:
+                    self._keys[listing.key] = sha
+                    self._urls[listing.image_url] = sha
+                listing.image_sha = sha
+                results[listing.key] = sha
+                # Identical bytes fetched concurrently can both be "new"
+                if is_new and sha not in new_blobs:
+                    new_blobs.append(sha)
+
+        self._make_thumbnails(new_blobs)
+        self.evict()
+        self.save_index()
+
+        logger.info(
+            "[Images] %s cached, %s downloaded, %s new blobs",
+            len(results),
+            len(pending),
+            len(new_blobs),
+        )
+        return results
+
+    def close(self) -> None:
+        """Shut down the thumbnail worker processes"""
+        if self._thumbnail_pool:
+            self._thumbnail_pool.shutdown(wait=True)
+            self._thumbnail_pool = None
+
+    def blob_path(self, sha: str) -> str:
+        return os.path.join(self.root_dir, "blobs", sha[:2], sha)
+
+    def thumbnail_path(self, sha: str) -> str:
+        return os.path.join(self.root_dir, "thumbs", sha[:2], f"{sha}.jpg")
+
+    def listing_hash(self, listing: Listing) -> Optional[int]:
+        """
+        dHash of a listing's fetched image, for ListingDeduplicator.check_images;
+        looked up by content, since signed image URLs change every scrape
+        """
+        with self._lock:
+            sha = listing.image_sha or self._keys.get(listing.key)
+            return self._blobs.get(sha, {}).get("dhash") if sha else None
+
+    def evict(self) -> int:
+        """Drop least-recently-used blobs until under the size budget"""
+        with self._lock:
+            total = sum(blob["size"] for blob in self._blobs.values())
+            if total <= self.settings.max_cache_bytes:
+                return 0
+
+            target = self.settings.max_cache_bytes * 0.9
+            evicted = []
+            for sha, blob in sorted(self._blobs.items(), key=lambda kv: kv[1]["atime"]):
+                if total <= target:
+                    break
+                total -= blob["size"]
+                evicted.append(sha)
+
+            for sha in evicted:
+                del self._blobs[sha]
+            evicted_set = set(evicted)
+            self._keys = {k: s for k, s in self._keys.items() if s not in evicted_set}
+            self._urls = {u: s for u, s in self._urls.items() if s not in evicted_set}
+
+        for sha in evicted:
+            for path in (self.blob_path(sha), self.thumbnail_path(sha)):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+        logger.info("[Images] Evicted %s blobs", len(evicted))
+        return len(evicted)
+
+    def save_index(self) -> None:
+        with self._lock:
+            data = {"keys": self._keys, "urls": self._urls, "blobs": self._blobs}
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.index_path)
+
+    def _load_index(self) -> None:
+        if not os.path.exists(self.index_path):
+            return
+        try:
+            with open(self.index_path, "r") as f:
+                data = json.load(f)
+            self._keys = data.get("keys", {})
+            self._urls = data.get("urls", {})
+            self._blobs = data.get("blobs", {})
+            logger.info("[Images] Loaded index with %s blobs", len(self._blobs))
+        except Exception as e:
+            logger.warning("[Images] Failed to load index: %s", e)
+
+    def _lookup(self, listing: Listing) -> Optional[str]:
+        """Cache hit by listing key (signed URLs change) or by exact URL"""
+        with self._lock:
+            sha = self._keys.get(listing.key) or self._urls.get(listing.image_url)
+            if not sha or sha not in self._blobs:
+                return None
+            if not os.path.exists(self.blob_path(sha)):
+                del self._blobs[sha]
+                return None
+            self._blobs[sha]["atime"] = time.time()
+            self._keys[listing.key] = sha
+            return sha
+
+    def _download(self, url: str) -> Tuple[str, bool]:
+        response = self.session.get(url, timeout=self.settings.timeout)
+        response.raise_for_status()
+        content = response.content
+        sha = hashlib.sha256(content).hexdigest()
+
+        path = self.blob_path(sha)
+        is_new = not os.path.exists(path)
+        if is_new:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+
+        with self._lock:
+            blob = self._blobs.setdefault(sha, {"size": len(content), "dhash": None})
+            blob["atime"] = time.time()
+        return sha, is_new
+
+    def _make_thumbnails(self, shas: List[str]) -> None:
+        if not shas:
+            return
+
+        for sha in shas:
+            os.makedirs(os.path.dirname(self.thumbnail_path(sha)), exist_ok=True)
+
+        # One pool for the service's lifetime; spawned rather than forked
+        # because the logging and watchdog threads are already running
+        if not self._thumbnail_pool:
+            self._thumbnail_pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.settings.thumbnail_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+        broken = False
+        futures = {
+            self._thumbnail_pool.submit(
+                make_thumbnail,
+                self.blob_path(sha),
+                self.thumbnail_path(sha),
+                self.settings.thumbnail_size,
+            ): sha
+            for sha in shas
+        }
+        for future in concurrent.futures.as_completed(futures):
+            sha = futures[future]
+            try:
+                dhash = future.result()
+            except concurrent.futures.process.BrokenProcessPool as e:
+                logger.warning("[Images] Thumbnail pool died: %s", e)
+                broken = True
+                continue
+            except Exception as e:
+                logger.warning("[Images] Thumbnail failed for %s: %s", sha[:12], e)
+                continue
+            thumb_size = os.path.getsize(self.thumbnail_path(sha))
+            with self._lock:
+                if sha in self._blobs:
+                    self._blobs[sha]["dhash"] = dhash
+                    self._blobs[sha]["size"] += thumb_size
+
+        if broken:
+            # Start a fresh pool next time rather than failing forever
+            self._thumbnail_pool.shutdown(wait=False)
+            self._thumbnail_pool = None
@@ -4,12 +4,17 @@ Proxy service with IPRoyal sticky sessions
 Ported from scraper code
 """
 
+import base64
 import datetime
 import hashlib
 import logging
 import os
+import socket
+import socketserver
+import threading
 import requests
-from typing import Optional
+from typing import List, Optional, Tuple
+from urllib.parse import unquote, urlparse
 
 
 logger = logging.getLogger(__name__)
@@ -18,11 +23,16 @@ logger = logging.getLogger(__name__)
 class ProxyService:
     # Manages IPRoyal residential proxy with sticky sessions
     
-    def __init__(self):
+    def __init__(self, city: Optional[str] = None, session_key: Optional[str] = None):
         self.user = os.getenv("IPROYAL_USER")
         self.password = os.getenv("IPROYAL_PASS") 
         self.country = os.getenv("PROXY_COUNTRY", "gb")
-        self.city = os.getenv("PROXY_CITIES", "edinburgh").split(',')[0]
+        self.cities: List[str] = [
+            c.strip() for c in os.getenv("PROXY_CITIES", "edinburgh").split(',') if c.strip()
+        ]
+        # Geo shards pin their own exit city, and their own sticky IP
+        self.city = city or (self.cities[0] if self.cities else None)
+        self.session_key = session_key
         self.host = "geo.iproyal.com"
         self.port = "12321"
         
@@ -50,9 +60,13 @@ class ProxyService:
     
     
     def _get_daily_session_id(self) -> str:
-        # Generate consistent session ID for current day
+        # Generate consistent session ID for current day; a session key
+        # (the geo shard name) gives each shard its own sticky IP
         today = datetime.date.today().strftime("%Y-%m-%d")
-        session_hash = hashlib.md5(f"facebook-messenger-{today}".encode()).hexdigest()
+        seed = f"facebook-messenger-{today}"
+        if self.session_key:
+            seed = f"facebook-messenger-{self.session_key}-{today}"
+        session_hash = hashlib.md5(seed.encode()).hexdigest()
         return session_hash[:8]
     
 
@@ -77,4 +91,121 @@ class ProxyService:
     
     def is_configured(self) -> bool:
         # Check if proxy is properly configured
-        return bool(self.user and self.password)
+        return bool(self.user and self.password)
+
+
+class _ForwardingServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    upstream: Tuple[str, int]
+    auth_header: bytes
+
+
+class _ForwardHandler(socketserver.StreamRequestHandler):
+    # Adds credentials to one client request, then relays bytes both ways
+    
+    HOP_HEADERS = (b"proxy-authorization", b"proxy-connection", b"connection")
+    
+    def handle(self):
+        lines = []
+        while True:
+            line = self.rfile.readline(65537)
+            if not line or line in (b"\r\n", b"\n"):
+                break
+            lines.append(line)
+        if not lines:
+            return
+        
+        request_line = lines[0]
+        headers = [
+            line for line in lines[1:]
+            if line.split(b":", 1)[0].strip().lower() not in self.HOP_HEADERS
+        ]
+        headers.append(self.server.auth_header)
+        # Later requests on a kept-alive connection would go out unauthenticated
+        if not request_line.upper().startswith(b"CONNECT "):
+            headers.append(b"Connection: close\r\n")
+        
+        try:
+            upstream = socket.create_connection(self.server.upstream, timeout=30)
+        except OSError as e:
+            logger.warning("[Proxy] Upstream connect failed: %s", e)
+            self.wfile.write(b"HTTP/1.1 502 Bad Gateway\r\nConnection: close\r\n\r\n")
+            return
+        
+        upstream.settimeout(None)
+        with upstream:
+            upstream.sendall(request_line + b"".join(headers) + b"\r\n")
+            reader = threading.Thread(
+                target=self._pipe, args=(upstream, self.connection), daemon=True
+            )
+            reader.start()
+            try:
+                # read1 so bytes already buffered by readline() are sent too
+                while True:
+                    data = self.rfile.read1(65536)
+                    if not data:
+                        break
+                    upstream.sendall(data)
+                upstream.shutdown(socket.SHUT_WR)
+            except OSError:
+                pass
+            reader.join()
+    
+    @staticmethod
+    def _pipe(source: socket.socket, target: socket.socket) -> None:
+        try:
+            while True:
+                data = source.recv(65536)
+                if not data:
+                    break
+                target.sendall(data)
+            target.shutdown(socket.SHUT_WR)
+        except OSError:
+            pass
+
+
+class ProxyForwarder:
+    # Local unauthenticated proxy in front of an authenticated upstream.
+    # Chrome's --proxy-server cannot carry credentials, so each browser
+    # points at its own forwarder, which adds them for its proxy URL.
+    
+    def __init__(self, proxy_url: str):
+        proxy = urlparse(proxy_url)
+        self.upstream = (proxy.hostname, proxy.port or 80)
+        credentials = f"{unquote(proxy.username or '')}:{unquote(proxy.password or '')}"
+        token = base64.b64encode(credentials.encode()).decode()
+        self.auth_header = f"Proxy-Authorization: Basic {token}\r\n".encode()
+        self._server: Optional[_ForwardingServer] = None
+    
+    
+    @property
+    def address(self) -> Optional[str]:
+        if not self._server:
+            return None
+        host, port = self._server.server_address[:2]
+        return f"{host}:{port}"
+    
+    
+    def start(self) -> str:
+        if self._server:
+            return self.address
+        
+        server = _ForwardingServer(("127.0.0.1", 0), _ForwardHandler)
+        server.upstream = self.upstream
+        server.auth_header = self.auth_header
+        threading.Thread(
+            target=server.serve_forever, name="proxy-forwarder", daemon=True
+        ).start()
+        self._server = server
+        logger.info(
+            "[Proxy] Forwarding %s -> %s:%s", self.address, *self.upstream
+        )
+        return self.address
+    
+    
+    def stop(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -5,29 +5,26 @@ Tests the refactored scraper with SOLID principles
 """
 
 import logging
-import sys
+import os
 import time
 
 from dotenv import load_dotenv
 
 from src.core.config_service import get_config
+from src.core.logging_service import log_context, setup_logging
+from src.scraper.driver_replay import RecordingDriver
 from src.scraper.marketplace_scraper import MarketplaceScraper
+from src.services.artifact_service import ArtifactService
 from src.services.browser_service import BrowserService
+from src.services.driver_watchdog import DriverWatchdog
 from src.services.facebook_service import FacebookService
 from src.services.proxy_service import ProxyService
 from src.services.session_service import SessionService
 
 load_dotenv()
 
-# Configure logging
-file_handler = logging.FileHandler("/app/logs/output.log", mode="w")
-file_handler.setFormatter(logging.Formatter("%(message)s"))
-
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(message)s",
-    handlers=[logging.StreamHandler(sys.stdout), file_handler],
-)
+# Configure logging (queued, written by a background thread)
+setup_logging(get_config())
 logger = logging.getLogger(__name__)
 
 
@@ -36,6 +33,9 @@ def test_navigation():
 
     SEARCH_QUERY = "canon"
     MAX_RESULTS = 3
+    MAX_SCROLLS = 20
+    # Save DOM snapshots for benchmark_scraper.py
+    RECORD_SESSION = os.getenv("RECORD_SESSION")
 
     logger.info("=" * 80)
     logger.info("🧪 Testing Facebook Marketplace Scraper")
@@ -53,11 +53,35 @@ def test_navigation():
                 logger.warning("[Test] ⚠️  Proxy test failed, continuing anyway...")
 
         # Create services
-        browser = BrowserService(config, proxy_service)
+        artifacts = ArtifactService(config)
+        browser = BrowserService(config, proxy_service, artifacts)
         session = SessionService(config)
         facebook = FacebookService(config, browser, session)
+        scraper = None
+
+        def scraper_driver():
+            driver = browser.get_driver()
+            return RecordingDriver(driver) if RECORD_SESSION else driver
+
+        def recover() -> bool:
+            """After a driver restart: log back in and return to the results"""
+            # Under deadlines, as a wedged driver here would hang forever
+            if not watchdog.run("restore_session", facebook.restore_session):
+                return False
+            if scraper is None:
+                return True
+            scraper.set_driver(scraper_driver())
+            return watchdog.run("search", scraper.search, SEARCH_QUERY)
+
+        watchdog = DriverWatchdog(config, browser, on_restart=recover)
+
+        proxy_name = proxy_service.city if proxy_service else None
+
+        with browser, log_context(
+            query=SEARCH_QUERY, worker="scraper-test", proxy=proxy_name
+        ):
+            watchdog.start()
 
-        with browser:
             # Restore session
             logger.info("\n[Test] Restoring Facebook session...")
 
@@ -69,19 +93,30 @@ def test_navigation():
             logger.info("[Test] ✅ Session restored")
 
             # Create scraper
-            scraper = MarketplaceScraper(browser.get_driver())
+            scraper = MarketplaceScraper(
+                scraper_driver(), artifacts=artifacts, profile=config.performance
+            )
 
             # Search
             logger.info(f"\n[Test] Searching for '{SEARCH_QUERY}'...")
 
-            if not scraper.search(SEARCH_QUERY):
+            if not watchdog.run("search", scraper.search, SEARCH_QUERY):
                 logger.error("[Test] ❌ Search failed")
                 browser.take_screenshot("search_failed")
                 return
 
             # Collect results
             logger.info(f"\n[Test] Collecting first {MAX_RESULTS} results...")
-            listings = scraper.collect_listings(max_listings=MAX_RESULTS)
+            listings = watchdog.run(
+                "collect_listings",
+                scraper.collect_listings,
+                max_listings=MAX_RESULTS,
+                max_scrolls=MAX_SCROLLS,
+                deadline=config.performance.collect_deadline(MAX_SCROLLS),
+            )
+
+            if RECORD_SESSION:
+                scraper.driver.recording.save(RECORD_SESSION)
 
             if not listings:
                 logger.error("[Test] ❌ No listings found")
@@ -98,6 +133,11 @@ def test_navigation():
         if "browser" in locals():
             browser.take_screenshot("test_error")
         raise
+    finally:
+        if "watchdog" in locals():
+            watchdog.stop()
+        if "artifacts" in locals():
+            artifacts.stop()
 
 
 if __name__ == "__main__":